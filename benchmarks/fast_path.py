@@ -0,0 +1,60 @@
+"""
+Compare per-call latency of the SQLAlchemy Core selects (mapped to views) and
+the raw asyncpg fast path lookups.
+
+Needs a database configured in .env (same as the bot):
+
+    python -m benchmarks.fast_path [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable
+
+from config import DB_URL
+from core.db.database_handler import DatabaseHandler
+
+
+async def measure(name: str, call: Callable[[], Awaitable], iterations: int) -> float:
+    for _ in range(min(iterations, 100)):  # warm up pool and statement caches
+        await call()
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    per_call_us = (time.perf_counter() - started_at) / iterations * 1_000_000
+    print(f"{name:<40} {per_call_us:10.1f} us/call")
+    return per_call_us
+
+
+async def main(iterations: int) -> None:
+    # user_cache_size=0 so get_user really reaches the database
+    core = DatabaseHandler(DB_URL, pool_size=1, user_cache_size=0)
+    fast = DatabaseHandler(DB_URL, pool_size=1, user_cache_size=0, use_fast_path=True)
+    await core.init()
+
+    user_tg_id = 1
+    await core.create_or_get_user(user_tg_id, first_name="Benchmark")
+    names = ["greetings", "exchange_button", "rate_button", "settings_button"]
+
+    cases = {
+        "get_user": lambda db: db.get_user(user_tg_id),
+        "get_text_items_by_name": lambda db: db.get_text_items_by_name(names, "ru"),
+        "get_currency_by_symbol": lambda db: db.get_currency_by_symbol("kzt"),
+    }
+    try:
+        for name, call in cases.items():
+            core_us = await measure(
+                f"{name} (core select)", lambda: call(core), iterations
+            )
+            fast_us = await measure(
+                f"{name} (fast path)", lambda: call(fast), iterations
+            )
+            print(f"{'':<40} {core_us - fast_us:10.1f} us saved per call\n")
+    finally:
+        await core.close()
+        await fast.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
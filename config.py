@@ -1,4 +1,5 @@
 import os
+import re
 
 import dotenv
 
@@ -15,3 +16,39 @@ DB_PORT = os.getenv("POSTGRES_PORT")
 DB_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 LEAD_CHAT = os.getenv("LEAD_CHAT")
 ADMIN_URL = os.getenv("ADMIN_URL")
+TEXT_CACHE_TTL = float(os.getenv("TEXT_CACHE_TTL", "300"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEB_SERVER_HOST = os.getenv("WEB_SERVER_HOST", "0.0.0.0")
+WEB_SERVER_PORT = int(os.getenv("WEB_SERVER_PORT", "8080"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("true", "1", "yes")
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+DB_FAST_PATH = os.getenv("DB_FAST_PATH", "false").lower() in ("true", "1", "yes")
+RATE_FEED_FILE = os.getenv("RATE_FEED_FILE")
+RATE_FEED_URL = os.getenv("RATE_FEED_URL")
+RATE_FEED_INTERVAL = float(os.getenv("RATE_FEED_INTERVAL", "60"))
+RATE_FEED_MAX_STALENESS = float(os.getenv("RATE_FEED_MAX_STALENESS", "600"))
+ROUTE_MAX_HOPS = int(os.getenv("ROUTE_MAX_HOPS", "3"))
+QUOTE_TTL = float(os.getenv("QUOTE_TTL", "300"))
+INLINE_CACHE_TIME = int(os.getenv("INLINE_CACHE_TIME", "30"))
+
+if BOT_MODE not in ("polling", "webhook"):
+    raise RuntimeError(f"BOT_MODE must be 'polling' or 'webhook', got {BOT_MODE!r}")
+if BOT_MODE == "webhook":
+    if not WEBHOOK_URL:
+        raise RuntimeError("WEBHOOK_URL must be set when BOT_MODE=webhook")
+    # Without a secret anyone who knows the URL can post fake updates
+    if not WEBHOOK_SECRET or not re.fullmatch(r"[A-Za-z0-9_-]{1,256}", WEBHOOK_SECRET):
+        raise RuntimeError(
+            "WEBHOOK_SECRET must be set when BOT_MODE=webhook "
+            "(1-256 characters: A-Z, a-z, 0-9, _ and -)"
+        )
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from core.db.views import CurrencyView, PairView
+
+PairKey = Tuple[str, str]
+
+if TYPE_CHECKING:
+    from core.db.database_handler import DatabaseHandler
+
+
+@dataclass(frozen=True)
+class CurrencySnapshot:
+    """Immutable view of currencies and currency pairs at some point in time."""
+
+    version: int = 0
+    currencies: Dict[str, CurrencyView] = field(default_factory=dict)
+    pairs: Dict[PairKey, PairView] = field(default_factory=dict)
+
+    @property
+    def active_pairs(self) -> List[PairView]:
+        return [pair for pair in self.pairs.values() if pair.is_active]
+
+    def get_currency(self, symbol: str) -> Optional[CurrencyView]:
+        return self.currencies.get(symbol)
+
+    def get_pair(self, from_symbol: str, to_symbol: str) -> Optional[PairView]:
+        """Return the active pair for the given symbols, same as get_currency_pair."""
+        pair = self.pairs.get((from_symbol, to_symbol))
+        if pair is None or not pair.is_active:
+            return None
+        return pair
+
+
+class CurrencyCache:
+    """
+    Holder of the current :class:`CurrencySnapshot`.
+
+    Readers grab ``cache.snapshot`` once and work with it; writers build a new
+    snapshot and swap the reference, so a reader never sees a half-updated state.
+    Writes made by other processes are reported by ``ChangeListener`` and picked
+    up with :meth:`schedule_load`.
+    """
+
+    def __init__(self, retry_interval: float = 5.0):
+        self.snapshot = CurrencySnapshot()
+        self.retry_interval = retry_interval
+        self._lock = asyncio.Lock()
+        self._reload_requested = False
+        self._reload_task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[], None]] = []
+        self._rate_listeners: List[Callable[[Dict[PairKey, PairView]], None]] = []
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback that is called every time the snapshot is reloaded."""
+        self._listeners.append(callback)
+
+    def add_rate_listener(
+        self, callback: Callable[[Dict[PairKey, PairView]], None]
+    ) -> None:
+        """Register a callback that gets the changed pairs after :meth:`apply_rates`."""
+        self._rate_listeners.append(callback)
+
+    def apply_rates(self, rates: Dict[PairKey, Decimal]) -> None:
+        """
+        Swap in a snapshot with new rates of the given pairs only.
+
+        Rate-only changes do not touch currencies, so the plain listeners
+        (keyboards) are not notified, only the rate listeners.
+        """
+        pairs = dict(self.snapshot.pairs)
+        changed = {}
+        for key, rate in rates.items():
+            pair = pairs.get(key)
+            if pair is not None and pair.rate != rate:
+                pairs[key] = changed[key] = replace(pair, rate=rate)
+        self._swap_rates(pairs, changed)
+
+    def _swap_rates(
+        self, pairs: Dict[PairKey, PairView], changed: Dict[PairKey, PairView]
+    ) -> None:
+        if not changed:
+            return
+        self.snapshot = replace(
+            self.snapshot, version=self.snapshot.version + 1, pairs=pairs
+        )
+        for callback in self._rate_listeners:
+            callback(changed)
+
+    async def load(self, db: DatabaseHandler) -> None:
+        """
+        Load currencies and all currency pairs and swap the snapshot.
+
+        Listeners are only called for what really changed: nothing for an
+        identical snapshot, the rate listeners if only pair rates differ.
+        """
+        async with self._lock:
+            currencies = await db.get_currencies()
+            pairs = await db.get_currency_pairs(only_active=False)
+            currencies = {currency.symbol: currency for currency in currencies}
+            pairs = {
+                (pair.from_currency.symbol, pair.to_currency.symbol): pair
+                for pair in pairs
+            }
+            old = self.snapshot
+            if currencies == old.currencies and pairs.keys() == old.pairs.keys():
+                changed = {
+                    key: pair for key, pair in pairs.items() if pair != old.pairs[key]
+                }
+                if all(
+                    replace(old.pairs[key], rate=pair.rate) == pair
+                    for key, pair in changed.items()
+                ):
+                    self._swap_rates(pairs, changed)
+                    return
+            self.snapshot = CurrencySnapshot(
+                version=old.version + 1, currencies=currencies, pairs=pairs
+            )
+        logger.debug(
+            f"Currency snapshot v{self.snapshot.version} loaded: "
+            f"{len(currencies)} currencies, {len(pairs)} pairs"
+        )
+        for callback in self._listeners:
+            callback()
+
+    def schedule_load(self, db: DatabaseHandler) -> None:
+        """
+        Reload the snapshot in the background. Requests made while a reload is
+        running are folded into one more reload; failed reloads are retried.
+        """
+        self._reload_requested = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._reload(db))
+
+    async def _reload(self, db: DatabaseHandler) -> None:
+        while self._reload_requested:
+            self._reload_requested = False
+            try:
+                await self.load(db)
+            except Exception as e:
+                logger.error(f"Failed to reload currency snapshot: {e}")
+                self._reload_requested = True
+                await asyncio.sleep(self.retry_interval)
+
+    async def stop(self) -> None:
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            try:
+                await self._reload_task
+            except asyncio.CancelledError:
+                pass
+            self._reload_task = None
@@ -0,0 +1,70 @@
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from aiogram.types import InlineKeyboardMarkup
+
+KeyboardBuilder = TypeVar(
+    "KeyboardBuilder", bound=Callable[..., Awaitable[InlineKeyboardMarkup]]
+)
+
+
+class KeyboardCache:
+    """
+    Registry of prebuilt keyboards keyed by builder name and its arguments
+    (language, role, excluded currencies, ...).
+
+    Every invalidation bumps ``version`` so a keyboard that was being built while
+    the underlying data changed is not stored.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._keyboards: Dict[Tuple[Hashable, ...], InlineKeyboardMarkup] = {}
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[InlineKeyboardMarkup]:
+        return self._keyboards.get(key)
+
+    def set(
+        self, key: Tuple[Hashable, ...], keyboard: InlineKeyboardMarkup, version: int
+    ) -> None:
+        if version == self.version:
+            self._keyboards[key] = keyboard
+
+    def invalidate(self) -> None:
+        """Drop all prebuilt keyboards, they are rebuilt on the next call."""
+        self.version += 1
+        self._keyboards = {}
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def cached_keyboard(builder: KeyboardBuilder) -> KeyboardBuilder:
+    """
+    Memoize a keyboard builder in ``db.keyboard_cache``.
+
+    The builder must take a ``db`` argument; all other arguments form the cache key.
+    """
+    signature = inspect.signature(builder)
+    name = builder.__qualname__
+
+    @functools.wraps(builder)
+    async def wrapper(*args: Any, **kwargs: Any) -> InlineKeyboardMarkup:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        cache: KeyboardCache = arguments.pop("db").keyboard_cache
+
+        key = (name, *(_freeze(value) for value in arguments.values()))
+        keyboard = cache.get(key)
+        if keyboard is None:
+            version = cache.version
+            keyboard = await builder(*args, **kwargs)
+            cache.set(key, keyboard, version)
+        return keyboard
+
+    return wrapper
@@ -0,0 +1,110 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from loguru import logger
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style request coalescing.
+
+    Keys requested during one event loop tick are collected and loaded with a
+    single ``batch_fn`` call, then the results are fanned back out to every
+    waiting coroutine. A key that is already being loaded is not requested again:
+    later callers share the in-flight future (single-flight) until the key is
+    written and :meth:`forget` is called.
+
+    ``batch_fn`` gets a list of unique keys and returns a dict with the keys it
+    found; missing keys resolve to ``None``.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 500,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.keys_loaded = 0
+        self.coalesced = 0
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._in_flight: Dict[K, asyncio.Future] = {}
+        self._dispatch_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._in_flight.get(key) or self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._dispatch)
+        # A cancelled caller must not cancel the future other callers share
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def forget(self, key: K) -> None:
+        """
+        Call after writing ``key``: a load already in flight may return the old
+        value, so later callers must not join it and get a fresh load instead.
+        """
+        self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "coalesced": self.coalesced,
+        }
+
+    def _dispatch(self) -> None:
+        self._dispatch_scheduled = False
+        pending, self._pending = self._pending, {}
+        self._in_flight.update(pending)
+        keys = list(pending)
+        for i in range(0, len(keys), self.max_batch_size):
+            batch = {key: pending[key] for key in keys[i : i + self.max_batch_size]}
+            task = asyncio.create_task(self._load_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: Dict[K, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys_loaded += len(batch)
+        try:
+            values = await self.batch_fn(list(batch))
+        except Exception as e:
+            logger.error(f"Batch load of {len(batch)} keys failed: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
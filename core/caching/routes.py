@@ -0,0 +1,161 @@
+import asyncio
+import math
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from loguru import logger
+
+from core.caching.currencies import CurrencySnapshot, PairKey
+from core.db.views import PairView
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """Best conversion path between two currencies and its combined rate."""
+
+    path: Tuple[str, ...]
+    rate: Decimal
+    weight: float
+
+    @property
+    def hops(self) -> int:
+        return len(self.path) - 1
+
+
+Edges = Dict[str, Dict[str, Tuple[Decimal, float]]]
+
+
+class RouteTable:
+    """
+    All-pairs table of the best conversion routes over the active currency pairs.
+
+    Pairs are edges weighted with ``-log(rate)``, so the cheapest path is the one
+    with the highest combined rate. Routes are limited to ``max_hops`` pairs and
+    never visit a currency twice. Lookups are a dict access. Every source
+    remembers which currencies its search expanded; when some rates change, only
+    the sources that expanded the changed pairs' currencies are searched again.
+
+    A full rebuild of a table with ``offload_threshold`` or more pairs is done in
+    a worker thread so it does not block the event loop.
+    """
+
+    def __init__(self, max_hops: int = 3, offload_threshold: int = 500):
+        self.max_hops = max_hops
+        self.offload_threshold = offload_threshold
+        self._edges: Edges = {}
+        self._routes: Dict[str, Dict[str, Route]] = {}
+        self._expanded: Dict[str, Set[str]] = {}
+
+    def get(self, from_symbol: str, to_symbol: str) -> Optional[Route]:
+        return self._routes.get(from_symbol, {}).get(to_symbol)
+
+    def rebuild(self, snapshot: CurrencySnapshot) -> None:
+        """Recompute the whole table from the active pairs of the snapshot."""
+        self._install(*self._build(snapshot))
+
+    async def rebuild_in_thread(
+        self, current_snapshot: Callable[[], CurrencySnapshot]
+    ) -> None:
+        """
+        Same as :meth:`rebuild` off the event loop. The old table keeps serving
+        (and receiving :meth:`update`) meanwhile; if the snapshot was replaced
+        during the build, the table is built again from the new one.
+        """
+        while True:
+            snapshot = current_snapshot()
+            built = await asyncio.to_thread(self._build, snapshot)
+            if current_snapshot() is snapshot:
+                self._install(*built)
+                return
+
+    def update(self, changed: Dict[PairKey, PairView]) -> None:
+        """Apply changed pair rates and recompute only the affected sources."""
+        changed_from = set()
+        for (from_symbol, to_symbol), pair in changed.items():
+            if pair.is_active and pair.rate > 0:
+                self._set_edge(self._edges, pair)
+            else:
+                self._edges.get(from_symbol, {}).pop(to_symbol, None)
+            changed_from.add(from_symbol)
+
+        affected = {
+            source
+            for source, expanded in self._expanded.items()
+            if not expanded.isdisjoint(changed_from)
+        }
+        # A currency that just got its first pair is a new source
+        affected.update(symbol for symbol in changed_from if symbol in self._edges)
+        for source in affected:
+            self._routes[source], self._expanded[source] = self._search(
+                self._edges, source
+            )
+
+    def _build(
+        self, snapshot: CurrencySnapshot
+    ) -> Tuple[Edges, Dict[str, Dict[str, Route]], Dict[str, Set[str]]]:
+        edges: Edges = {}
+        for pair in snapshot.active_pairs:
+            if pair.rate > 0:
+                self._set_edge(edges, pair)
+        routes = {}
+        expanded = {}
+        for source in edges:
+            routes[source], expanded[source] = self._search(edges, source)
+        return edges, routes, expanded
+
+    def _install(
+        self,
+        edges: Edges,
+        routes: Dict[str, Dict[str, Route]],
+        expanded: Dict[str, Set[str]],
+    ) -> None:
+        self._edges, self._routes, self._expanded = edges, routes, expanded
+        logger.debug(
+            f"Route table rebuilt: {len(edges)} sources, "
+            f"{sum(len(row) for row in routes.values())} routes"
+        )
+
+    @staticmethod
+    def _set_edge(edges: Edges, pair: PairView) -> None:
+        edges.setdefault(pair.from_currency.symbol, {})[pair.to_currency.symbol] = (
+            pair.rate,
+            -math.log(pair.rate),
+        )
+
+    def _search(self, edges: Edges, source: str) -> Tuple[Dict[str, Route], Set[str]]:
+        """
+        Bellman-Ford limited to ``max_hops`` rounds, keeping paths simple.
+
+        Round ``i`` keeps one label per currency: the best route with exactly
+        ``i`` hops. The next round extends all of them, so the best route within
+        ``max_hops`` may go through a worse but shorter prefix. This is exact as
+        long as no cycle of pairs multiplies to more than 1 (no arbitrage);
+        otherwise a label that already visited the target can hide a better
+        simple route. Returns the best route to every reachable currency and
+        the currencies whose outgoing pairs were looked at.
+        """
+        best: Dict[str, Route] = {}
+        expanded: Set[str] = set()
+        layer: Dict[str, Route] = {source: Route((source,), Decimal(1), 0.0)}
+        for _ in range(self.max_hops):
+            next_layer: Dict[str, Route] = {}
+            for symbol, route in layer.items():
+                expanded.add(symbol)
+                for target, (rate, weight) in edges.get(symbol, {}).items():
+                    if target in route.path:
+                        continue
+                    candidate_weight = route.weight + weight
+                    current = next_layer.get(target)
+                    if current is None or candidate_weight < current.weight:
+                        next_layer[target] = Route(
+                            route.path + (target,), route.rate * rate, candidate_weight
+                        )
+            if not next_layer:
+                break
+            for target, route in next_layer.items():
+                current = best.get(target)
+                if current is None or route.weight < current.weight:
+                    best[target] = route
+            layer = next_layer
+        return best, expanded
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from core.db.database_handler import DatabaseHandler
+
+
+TextKey = Tuple[str, str]
+
+
+class TextCache:
+    """
+    In-memory copy of the whole text catalog keyed by (unique_name, language_code).
+
+    The catalog is loaded once at startup and reloaded when it is older than ``ttl``
+    seconds, so edits made outside of the bot (admin panel) still show up.
+    Writes done through the bot are applied immediately via :meth:`set`.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._items: Dict[TextKey, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._invalidated = False
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        if self._loaded_at is None or self._invalidated:
+            return True
+        return time.monotonic() - self._loaded_at > self.ttl
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback that is called every time the catalog changes."""
+        self._listeners.append(callback)
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            callback()
+
+    async def load(self, db: DatabaseHandler) -> None:
+        """Load the whole catalog from the database and replace the current one."""
+        items = await db.get_all_text_items()
+        changed = items != self._items
+        self._items = items
+        self._loaded_at = time.monotonic()
+        self._invalidated = False
+        logger.debug(f"Text cache loaded: {len(items)} items")
+        if changed:
+            self._notify()
+
+    async def refresh(self, db: DatabaseHandler) -> None:
+        """Reload the catalog if it is stale. Concurrent callers share one reload."""
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if not self.is_stale:
+                return
+            try:
+                await self.load(db)
+            except Exception as e:
+                # Keep serving the old catalog, try again on the next call
+                logger.error(f"Failed to refresh text cache: {e}")
+                if self._loaded_at is not None:
+                    self._loaded_at = time.monotonic()
+                    self._invalidated = False
+
+    def get_many(
+        self, unique_names: Iterable[str], language_code: str
+    ) -> Dict[str, str]:
+        """Return the cached texts for the given names; missing names are skipped."""
+        items = self._items
+        texts = {}
+        for name in unique_names:
+            content = items.get((name, language_code))
+            if content is not None:
+                texts[name] = content
+        return texts
+
+    def set(self, unique_name: str, language_code: str, content: str) -> None:
+        """Invalidation hook for writes done through DatabaseHandler."""
+        key = (unique_name, language_code)
+        if self._items.get(key) == content:
+            return
+        items = dict(self._items)
+        items[key] = content
+        self._items = items
+        self._notify()
+
+    def invalidate(self) -> None:
+        """Mark the catalog as stale so the next read reloads it."""
+        self._invalidated = True
@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.db.views import UserView
+
+
+class UserCache:
+    """
+    Capacity-bounded LRU of user records keyed by ``user_tg_id``.
+
+    DatabaseHandler writes every changed user through with :meth:`set`. Writes
+    made by other processes (admin panel, other replicas) are reported by
+    ``ChangeListener`` and dropped with :meth:`invalidate`. While those
+    reports can't be received the cache is not coherent and is bypassed, so a
+    stale language or ban flag is never served. ``ttl`` is only a safety net.
+
+    Every write bumps ``version`` so a record that was being read from the database
+    while it changed is not stored.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        self.coherent = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._users: "OrderedDict[int, Tuple[UserView, float]]" = OrderedDict()
+
+    def get(self, user_tg_id: int) -> Optional[UserView]:
+        if not self.coherent:
+            self.misses += 1
+            return None
+        entry = self._users.get(user_tg_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        user, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._users[user_tg_id]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_tg_id)
+        self.hits += 1
+        return user
+
+    def put(self, user: UserView, version: int) -> None:
+        """Store a record read from the database unless a write happened meanwhile."""
+        if version == self.version:
+            self._store(user)
+
+    def set(self, user: UserView) -> None:
+        """Write-through hook for user writes done through DatabaseHandler."""
+        self.version += 1
+        self._store(user)
+
+    def invalidate(self, user_tg_id: int) -> None:
+        self.version += 1
+        self._users.pop(user_tg_id, None)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._users.clear()
+
+    def set_coherent(self, coherent: bool) -> None:
+        """Enable or bypass the cache; either way nothing cached so far is kept."""
+        self.clear()
+        self.coherent = coherent
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "coherent": self.coherent,
+            "size": len(self._users),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _store(self, user: UserView) -> None:
+        if not self.coherent:
+            return
+        self._users[user.user_tg_id] = (user, time.monotonic() + self.ttl)
+        self._users.move_to_end(user.user_tg_id)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+            self.evictions += 1
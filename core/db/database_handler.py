@@ -1,15 +1,56 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
 from decimal import Decimal
-from typing import Any, Optional, Sequence, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 
-from sqlalchemy import delete, select
+from loguru import logger
+from sqlalchemy import (
+    CursorResult,
+    Row,
+    Select,
+    String,
+    and_,
+    bindparam,
+    case,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.orm import aliased
+from sqlalchemy.schema import CreateIndex, CreateTable
 
+from core.caching.currencies import CurrencyCache
+from core.caching.keyboards import KeyboardCache
+from core.caching.loader import BatchLoader
+from core.caching.routes import RouteTable
+from core.caching.texts import TextCache
+from core.caching.users import UserCache
 from core.db.base import Base
+from core.db.fast_path import FastPath
+from core.db.pool import InstrumentedPool
 from core.db.tables import (
     User,
     TextItem,
@@ -17,158 +58,391 @@ from core.db.tables import (
     Currency,
     CurrencyPair,
     PaymentCategory,
+    TypeEnum,
+)
+from core.db.notifications import (
+    CATALOG_CHANGES_CHANNEL,
+    CATALOG_CHANGES_TRIGGER,
+    USER_CHANGES_CHANNEL,
+    USER_CHANGES_TRIGGER,
+    ChangeListener,
 )
+from core.db.views import CurrencyView, PairView, UserView, view_columns
 from core.templates.texts import predefined_texts
 
+PREDEFINED_CURRENCIES = {
+    "kzt": "🇰🇿 KZT",
+    "rub": "🇷🇺 RUB",
+}
+
+PREDEFINED_PAYMENT_CATEGORIES = {
+    "goods": {
+        "en": "Goods",
+        "ru": "Товары",
+    },
+    "digital_goods": {
+        "en": "Digital Goods",
+        "ru": "Цифровые товары",
+    },
+    "bookings": {
+        "en": "Bookings",
+        "ru": "Бронирование",
+    },
+}
+
+
+SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+
+# create_all only creates missing tables, columns added to existing tables
+# must be listed here
+SCHEMA_MIGRATIONS = [
+    "ALTER TABLE exchange_orders ADD COLUMN IF NOT EXISTS rate NUMERIC(18, 8)",
+    "ALTER TABLE exchange_orders "
+    "ADD COLUMN IF NOT EXISTS converted_amount NUMERIC(18, 6)",
+    "ALTER TABLE users "
+    "ADD COLUMN IF NOT EXISTS is_blocked BOOLEAN NOT NULL DEFAULT false",
+    *USER_CHANGES_TRIGGER,
+    *CATALOG_CHANGES_TRIGGER,
+    # Currencies used to be seeded with a placeholder base rate of 1; reset
+    # them to 0 ("not priced") as long as nobody has set a real one
+    "UPDATE currencies SET rate = 0 "
+    "WHERE NOT EXISTS (SELECT 1 FROM currencies WHERE rate <> 1)",
+]
+
+
+def schema_fingerprint() -> str:
+    """Hash of the table definitions and of all predefined (seeded) data."""
+    dialect = postgresql.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    digest.update(
+        json.dumps(
+            [
+                predefined_texts,
+                PREDEFINED_CURRENCIES,
+                PREDEFINED_PAYMENT_CATEGORIES,
+                SCHEMA_MIGRATIONS,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+USER_COLUMNS = view_columns(UserView, User.__table__)
+CURRENCY_COLUMNS = view_columns(CurrencyView, Currency.__table__)
+_PAIR_COLUMNS = view_columns(PairView, CurrencyPair.__table__)
+_FROM_CURRENCY = Currency.__table__.alias("from_currency")
+_TO_CURRENCY = Currency.__table__.alias("to_currency")
+
+
+def _pairs_query() -> Select:
+    return (
+        select(
+            *_PAIR_COLUMNS,
+            *view_columns(CurrencyView, _FROM_CURRENCY),
+            *view_columns(CurrencyView, _TO_CURRENCY),
+        )
+        .join(_FROM_CURRENCY, _FROM_CURRENCY.c.id == CurrencyPair.from_currency_id)
+        .join(_TO_CURRENCY, _TO_CURRENCY.c.id == CurrencyPair.to_currency_id)
+    )
+
+
+def _pair_view(row: Row) -> PairView:
+    pair_size = len(_PAIR_COLUMNS)
+    currency_size = len(CURRENCY_COLUMNS)
+    return PairView(
+        *row[:pair_size],
+        CurrencyView(*row[pair_size : pair_size + currency_size]),
+        CurrencyView(*row[pair_size + currency_size :]),
+    )
+
 
 class DatabaseHandler:
     """
     Async database handler for managing shop operations.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        text_cache_ttl: float = 300.0,
+        user_cache_size: int = 10_000,
+        user_cache_ttl: float = 300.0,
+        route_max_hops: int = 3,
+        pool_size: int = 10,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 100,
+        statement_timeout_ms: Optional[int] = None,
+        use_fast_path: bool = False,
+    ):
         self.url = url
-        self.engine = create_async_engine(self.url, echo=False)
+        connect_args: Dict[str, Any] = {
+            "prepared_statement_cache_size": statement_cache_size,
+        }
+        if statement_timeout_ms:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(statement_timeout_ms)
+            }
+        self.engine = create_async_engine(
+            self.url,
+            echo=False,
+            poolclass=InstrumentedPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+        )
+        self.autocommit_engine = self.engine.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
         self.sessionmaker = async_sessionmaker(
             self.engine, autoflush=False, autocommit=False, expire_on_commit=False
         )
+        self.fast_path = FastPath(self.engine) if use_fast_path else None
+        self.text_cache = TextCache(ttl=text_cache_ttl)
+        self.keyboard_cache = KeyboardCache()
+        self.currency_cache = CurrencyCache()
+        self.user_cache = UserCache(max_size=user_cache_size, ttl=user_cache_ttl)
+        # Bypassed until the listener is connected
+        self.user_cache.set_coherent(False)
+        self.changes = ChangeListener(
+            self.url,
+            handlers={
+                USER_CHANGES_CHANNEL: lambda payload: self._invalidate_user(
+                    int(payload)
+                ),
+                CATALOG_CHANGES_CHANNEL: self._on_catalog_change,
+            },
+            on_coherence=self._set_coherent,
+        )
+        self.user_loader: BatchLoader[int, UserView] = BatchLoader(self._load_users)
+        self.text_loader: BatchLoader[Tuple[str, str], str] = BatchLoader(
+            self._load_text_items
+        )
+        self.text_cache.add_listener(self.keyboard_cache.invalidate)
+        self.currency_cache.add_listener(self.keyboard_cache.invalidate)
+        self.route_table = RouteTable(max_hops=route_max_hops)
+        self._route_rebuild: Optional[asyncio.Task] = None
+        self.currency_cache.add_listener(self._rebuild_routes)
+        self.currency_cache.add_rate_listener(self.route_table.update)
 
     async def init(self) -> None:
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        await self._create_predefined_texts()
-        await self._create_predefined_currencies()
-        await self._create_all_currency_pairs()
-        await self._create_predefined_payment_categories()
-
-    async def _create_predefined_texts(self) -> None:
-        """Создает в базе данных предопределенные тексты, если их нет"""
-        async with self.sessionmaker() as session:
-            for unique_name, translations in predefined_texts.items():
-                for lang_code, content in translations.items():
-                    existing = await session.scalar(
-                        select(TextItem).where(
-                            TextItem.unique_name == unique_name,
-                            TextItem.language_code == lang_code,
-                        )
-                    )
-                    if not existing:
-                        session.add(
-                            TextItem(
-                                unique_name=unique_name,
-                                language_code=lang_code,
-                                content=content,
-                            )
-                        )
-            await session.commit()
+        fingerprint = schema_fingerprint()
+        if await self._get_stored_fingerprint() == fingerprint:
+            logger.info("Schema fingerprint matches, skipping DDL and seeding")
+        else:
+            async with self.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                for migration in SCHEMA_MIGRATIONS:
+                    await conn.execute(text(migration))
+                await self._seed(conn)
+                await self._store_fingerprint(conn, fingerprint)
+        await asyncio.gather(self.text_cache.load(self), self.currency_cache.load(self))
+        self.keyboard_cache.invalidate()
+        self.changes.start()
 
-    async def _create_predefined_currencies(self) -> None:
-        """Создает в базе данных предопределенные валюты, если их нет"""
-        async with self.sessionmaker() as session:
-            predefined_currencies = {
-                "kzt": "🇰🇿 KZT",
-                "rub": "🇷🇺 RUB",
-            }
-            for symbol, name in predefined_currencies.items():
-                existing = await session.scalar(
-                    select(Currency).where(
-                        Currency.symbol == symbol,
+    async def _get_stored_fingerprint(self) -> Optional[str]:
+        try:
+            async with self.engine.connect() as conn:
+                return await conn.scalar(
+                    select(AppConfig.value).where(
+                        AppConfig.unique_name == SCHEMA_FINGERPRINT_KEY
                     )
                 )
-                if not existing:
-                    session.add(
-                        Currency(
-                            symbol=symbol,
-                            name=name,
-                            rate=Decimal("1.0"),
-                            is_active=True,
-                        )
-                    )
-            await session.commit()
+        except DBAPIError:
+            # app_config does not exist yet
+            return None
 
-    async def _create_all_currency_pairs(self) -> None:
-        """Создает все возможные пары валют между собой с is_active=False"""
-        async with self.sessionmaker() as session:
-            # Get all active currencies
-            currencies = await session.execute(
-                select(Currency).where(Currency.is_active == True)
+    @staticmethod
+    async def _store_fingerprint(conn: AsyncConnection, fingerprint: str) -> None:
+        stmt = insert(AppConfig).values(
+            unique_name=SCHEMA_FINGERPRINT_KEY,
+            value=fingerprint,
+            type_=TypeEnum.STRING,
+            description="Хэш схемы БД и предопределенных данных",
+            description_en="Hash of the DB schema and predefined data",
+        )
+        await conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AppConfig.unique_name],
+                set_={"value": stmt.excluded.value},
             )
-            currencies = currencies.scalars().all()
-
-            if len(currencies) < 2:
-                return  # Need at least 2 currencies to create pairs
-
-            # Create all possible pairs (including reverse)
-            for i, from_currency in enumerate(currencies):
-                for j, to_currency in enumerate(currencies):
-                    if i != j:  # Don't create pair with same currency
-                        # Check if pair already exists
-                        existing = await session.scalar(
-                            select(CurrencyPair).where(
-                                CurrencyPair.from_currency_id == from_currency.id,
-                                CurrencyPair.to_currency_id == to_currency.id,
-                            )
-                        )
+        )
 
-                        if not existing:
-                            # Calculate rate (for now use base rates)
-                            # In real application, this would come from external API
-                            from_rate = from_currency.rate
-                            to_rate = to_currency.rate
-                            if from_rate and to_rate and to_rate != 0:
-                                rate = from_rate / to_rate
-                            else:
-                                rate = Decimal("1.0")  # Default rate
-
-                            session.add(
-                                CurrencyPair(
-                                    from_currency_id=from_currency.id,
-                                    to_currency_id=to_currency.id,
-                                    rate=rate,
-                                    is_active=False,  # Initially inactive
-                                )
-                            )
+    async def _seed(self, conn: AsyncConnection) -> None:
+        """Заполняет справочные таблицы, по одному запросу на таблицу"""
+        for stage in (
+            self._create_predefined_texts,
+            self._create_predefined_currencies,
+            self._create_all_currency_pairs,
+            self._create_predefined_payment_categories,
+        ):
+            started_at = time.perf_counter()
+            result = await stage(conn)
+            logger.info(
+                f"Seeding {stage.__name__}: {result.rowcount} rows inserted "
+                f"in {(time.perf_counter() - started_at) * 1000:.1f} ms"
+            )
+
+    @staticmethod
+    async def _create_predefined_texts(conn: AsyncConnection) -> CursorResult:
+        """Создает в базе данных предопределенные тексты, если их нет"""
+        stmt = insert(TextItem).values(
+            [
+                {
+                    "unique_name": unique_name,
+                    "language_code": lang_code,
+                    "content": content,
+                }
+                for unique_name, translations in predefined_texts.items()
+                for lang_code, content in translations.items()
+            ]
+        )
+        return await conn.execute(
+            stmt.on_conflict_do_nothing(
+                index_elements=[TextItem.unique_name, TextItem.language_code]
+            )
+        )
 
-            await session.commit()
+    @staticmethod
+    async def _create_predefined_currencies(conn: AsyncConnection) -> CursorResult:
+        """Создает в базе данных предопределенные валюты, если их нет"""
+        stmt = insert(Currency).values(
+            [
+                {
+                    "symbol": symbol,
+                    "name": name,
+                    # 0 = no base rate yet, RateMatrix skips the currency
+                    "rate": Decimal("0"),
+                    "is_active": True,
+                }
+                for symbol, name in PREDEFINED_CURRENCIES.items()
+            ]
+        )
+        return await conn.execute(stmt.on_conflict_do_nothing())
+
+    @staticmethod
+    async def _create_all_currency_pairs(conn: AsyncConnection) -> CursorResult:
+        """Создает все возможные пары валют между собой с is_active=False"""
+        from_currency = aliased(Currency)
+        to_currency = aliased(Currency)
+        # Start from base rates, real ones are applied later by RateFeed
+        rate = case(
+            (
+                and_(from_currency.rate != 0, to_currency.rate != 0),
+                from_currency.rate / to_currency.rate,
+            ),
+            else_=Decimal("1.0"),
+        )
+        pairs = select(
+            from_currency.id,
+            to_currency.id,
+            rate,
+            false(),  # Initially inactive
+        ).join(
+            to_currency,
+            and_(
+                to_currency.id != from_currency.id,
+                to_currency.is_active == True,
+            ),
+        )
+        pairs = pairs.where(from_currency.is_active == True)
+        stmt = insert(CurrencyPair).from_select(
+            ["from_currency_id", "to_currency_id", "rate", "is_active"], pairs
+        )
+        return await conn.execute(
+            stmt.on_conflict_do_nothing(
+                index_elements=[
+                    CurrencyPair.from_currency_id,
+                    CurrencyPair.to_currency_id,
+                ]
+            )
+        )
 
-    async def _create_predefined_payment_categories(self) -> None:
+    @staticmethod
+    async def _create_predefined_payment_categories(
+        conn: AsyncConnection,
+    ) -> CursorResult:
         """Создает в базе данных предопределенные категории плтежей, если их нет"""
-        async with self.sessionmaker() as session:
-            categories = {
-                "goods": {
-                    "en": "Goods",
-                    "ru": "Товары",
-                },
-                "digital_goods": {
-                    "en": "Digital Goods",
-                    "ru": "Цифровые товары",
-                },
-                "bookings": {
-                    "en": "Bookings",
-                    "ru": "Бронирование",
-                },
-            }
-            for unique_name, translations in categories.items():
-                for lang_code, content in translations.items():
-                    existing = await session.scalar(
-                        select(PaymentCategory).where(
-                            PaymentCategory.unique_name == unique_name,
-                            PaymentCategory.language == lang_code,
-                        )
-                    )
-                    if not existing:
-                        session.add(
-                            PaymentCategory(
-                                unique_name=unique_name,
-                                language=lang_code,
-                                name=content,
-                            )
-                        )
-            await session.commit()
+        # payment_categories has no unique key to conflict on, so filter with NOT EXISTS
+        rows = values(
+            column("unique_name", String),
+            column("language", String),
+            column("name", String),
+            name="rows",
+        ).data(
+            [
+                (unique_name, lang_code, content)
+                for unique_name, translations in PREDEFINED_PAYMENT_CATEGORIES.items()
+                for lang_code, content in translations.items()
+            ]
+        )
+        missing = select(
+            rows.c.unique_name, rows.c.language, rows.c.name, true()
+        ).where(
+            ~exists().where(
+                PaymentCategory.unique_name == rows.c.unique_name,
+                PaymentCategory.language == rows.c.language,
+            )
+        )
+        return await conn.execute(
+            insert(PaymentCategory).from_select(
+                ["unique_name", "language", "name", "is_active"], missing
+            )
+        )
 
     async def close(self) -> None:
+        await self.changes.stop()
+        await self.currency_cache.stop()
         await self.engine.dispose()
 
+    def _set_coherent(self, coherent: bool) -> None:
+        self.user_cache.set_coherent(coherent)
+        if coherent:
+            # Catalog changes made while not listening were missed
+            self.currency_cache.schedule_load(self)
+            self.keyboard_cache.invalidate()
+
+    def _on_catalog_change(self, table: str) -> None:
+        """Обработчик уведомлений об изменении справочников из других процессов"""
+        if table in ("currencies", "currency_pairs"):
+            self.currency_cache.schedule_load(self)
+        elif table == "payment_categories":
+            # The categories keyboard is read straight from the table
+            self.keyboard_cache.invalidate()
+
+    def _rebuild_routes(self) -> None:
+        snapshot = self.currency_cache.snapshot
+        if len(snapshot.pairs) < self.route_table.offload_threshold:
+            self.route_table.rebuild(snapshot)
+        elif self._route_rebuild is None or self._route_rebuild.done():
+            # A running rebuild notices the new snapshot and starts over
+            self._route_rebuild = asyncio.create_task(
+                self.route_table.rebuild_in_thread(lambda: self.currency_cache.snapshot)
+            )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters of the in-memory caches and batch loaders."""
+        return {
+            "users": self.user_cache.stats(),
+            "user_loader": self.user_loader.stats(),
+            "text_loader": self.text_loader.stats(),
+        }
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool usage: checked out connections, waits, overflow."""
+        return self.engine.sync_engine.pool.report()
+
     # ==================== USER OPERATIONS ====================
 
     async def create_or_get_user(
@@ -178,59 +452,117 @@ class DatabaseHandler:
         last_name: Optional[str] = None,
         username: Optional[str] = None,
         language: Optional[str] = "ru",
-    ) -> User:
-        async with self.sessionmaker() as session:
-            result = await session.execute(
-                select(User).where(User.user_tg_id == user_tg_id)
+    ) -> UserView:
+        """
+        Create the user or refresh its names in one round trip.
+
+        Existing names are only overwritten by non-empty values, and the row is
+        only written when something actually changed.
+        """
+        stmt = insert(User).values(
+            user_tg_id=user_tg_id,
+            first_name=first_name,
+            last_name=last_name,
+            username=username,
+            language=language,
+            is_admin=False,
+            is_banned=False,
+            is_agreed_with_terms=False,
+            is_blocked=False,
+        )
+        # Обновляем данные если изменились
+        new_values = {
+            name: func.coalesce(
+                func.nullif(getattr(stmt.excluded, name), ""), getattr(User, name)
             )
-            user = result.scalar_one_or_none()
-
-            if user:
-                # Обновляем данные если изменились
-                if username and user.username != username:
-                    user.username = username
-                if first_name and user.first_name != first_name:
-                    user.first_name = first_name
-                if last_name and user.last_name != last_name:
-                    user.last_name = last_name
-                await session.commit()
-                return user
-
-            # Создаем нового пользователя
-            user = User(
-                user_tg_id=user_tg_id,
-                first_name=first_name,
-                last_name=last_name,
-                username=username,
-                language=language,
+            for name in ("username", "first_name", "last_name")
+        }
+        upserted = (
+            stmt.on_conflict_do_update(
+                index_elements=[User.user_tg_id],
+                # Writing to the bot means it is not blocked anymore
+                set_={**new_values, "is_blocked": False, "updated_at": func.now()},
+                where=or_(
+                    User.is_blocked,
+                    *(
+                        getattr(User, name).is_distinct_from(value)
+                        for name, value in new_values.items()
+                    ),
+                ),
             )
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
+            .returning(*User.__table__.c)
+            .cte("upserted")
+        )
+        # Nothing changed -> DO UPDATE ... WHERE skips the row, read it instead
+        unchanged = select(*USER_COLUMNS).where(
+            User.user_tg_id == user_tg_id, ~exists(select(upserted.c.id))
+        )
+        query = union_all(select(*view_columns(UserView, upserted)), unchanged)
+
+        # Single statement, no need for BEGIN/COMMIT round trips around it
+        async with self.autocommit_engine.connect() as conn:
+            row = (await conn.execute(query)).first()
+
+        if row is None:
+            # The row was inserted concurrently after this statement's snapshot
+            self._invalidate_user(user_tg_id)
+            return await self.get_user(user_tg_id)
+        user = UserView(*row)
+        self._store_user(user)
+        return user
+
+    def _store_user(self, user: UserView) -> None:
+        """Write-through after a user write done here."""
+        self.user_loader.forget(user.user_tg_id)
+        self.user_cache.set(user)
+
+    def _invalidate_user(self, user_tg_id: int) -> None:
+        self.user_loader.forget(user_tg_id)
+        self.user_cache.invalidate(user_tg_id)
+
+    async def get_user(self, user_tg_id: int) -> Optional[UserView]:
+        user = self.user_cache.get(user_tg_id)
+        if user is not None:
             return user
 
-    async def get_user(self, user_tg_id: int) -> Optional[User]:
-        async with self.sessionmaker() as session:
-            result = await session.execute(
-                select(User).where(User.user_tg_id == user_tg_id)
-            )
-            return result.scalar_one_or_none()
+        return await self.user_loader.load(user_tg_id)
 
-    async def update_user(self, user_tg_id: int, **kwargs: Any) -> Optional[User]:
-        async with self.sessionmaker() as session:
-            async with session.begin():
-                result = await session.execute(
-                    select(User).where(User.user_tg_id == user_tg_id)
+    async def _load_users(self, user_tg_ids: List[int]) -> Dict[int, UserView]:
+        """Batch function of ``user_loader``: one query for all requested users."""
+        version = self.user_cache.version
+        if self.fast_path:
+            users = await self.fast_path.get_users(user_tg_ids)
+        else:
+            async with self.engine.connect() as conn:
+                result = await conn.execute(
+                    select(*USER_COLUMNS).where(User.user_tg_id.in_(user_tg_ids))
                 )
-                user = result.scalar_one_or_none()
-                if not user:
-                    return None
+                users = {row.user_tg_id: UserView(*row) for row in result}
+        for user in users.values():
+            self.user_cache.put(user, version)
+        return users
 
-                for key, value in kwargs.items():
-                    if hasattr(user, key):
-                        setattr(user, key, value)
+    async def update_user(self, user_tg_id: int, **kwargs: Any) -> Optional[UserView]:
+        values = {
+            key: value for key, value in kwargs.items() if key in User.__table__.c
+        }
+        if not values:
+            return await self.get_user(user_tg_id)
 
-            return user
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                update(User)
+                .where(User.user_tg_id == user_tg_id)
+                .values(**values)
+                .returning(*USER_COLUMNS)
+            )
+            row = result.first()
+        if row is None:
+            self._invalidate_user(user_tg_id)
+            return None
+        user = UserView(*row)
+        self._store_user(user)
+        return user
 
     async def delete_user(self, user_tg_id: int) -> bool:
         async with self.sessionmaker() as session:
@@ -238,7 +570,8 @@ class DatabaseHandler:
                 result = await session.execute(
                     delete(User).where(User.user_tg_id == user_tg_id)
                 )
-                return True
+        self._invalidate_user(user_tg_id)
+        return True
 
     async def ban_user(self, user_tg_id: int) -> bool:
         return await self.update_user(user_tg_id, is_banned=True) is not None
@@ -248,29 +581,88 @@ class DatabaseHandler:
 
     async def get_all_users(
         self, limit: int = 100, offset: int = 0, is_banned: Optional[bool] = None
-    ) -> Sequence[User]:
-        async with self.sessionmaker() as session:
-            stmt = select(User)
-            if is_banned is not None:
-                stmt = stmt.where(User.is_banned == is_banned)
-            stmt = stmt.limit(limit).offset(offset).order_by(User.created_at.desc())
-            result = await session.execute(stmt)
-            return result.scalars().all()
+    ) -> List[UserView]:
+        stmt = select(*USER_COLUMNS)
+        if is_banned is not None:
+            stmt = stmt.where(User.is_banned == is_banned)
+        stmt = stmt.limit(limit).offset(offset).order_by(User.created_at.desc())
+        async with self.engine.connect() as conn:
+            result = await conn.execute(stmt)
+            return [UserView(*row) for row in result]
+
+    async def get_broadcast_recipients(
+        self, after_id: int = 0, limit: int = 500
+    ) -> List[Tuple[int, int]]:
+        """
+        Return ``(id, user_tg_id)`` of the next page of users to broadcast to.
+
+        Keyset pagination on the primary key: every page is an index range scan
+        that starts right after ``after_id``, however deep the broadcast is.
+        Banned users and users who blocked the bot are skipped.
+        """
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(User.id, User.user_tg_id)
+                .where(
+                    User.id > after_id,
+                    User.is_banned == False,
+                    User.is_blocked == False,
+                )
+                .order_by(User.id)
+                .limit(limit)
+            )
+            return [(row.id, row.user_tg_id) for row in result]
+
+    async def mark_users_blocked(self, user_tg_ids: List[int]) -> None:
+        """Flag users who blocked the bot so broadcasts skip them."""
+        if not user_tg_ids:
+            return
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                update(User)
+                .where(User.user_tg_id.in_(user_tg_ids))
+                .values(is_blocked=True)
+            )
+        for user_tg_id in user_tg_ids:
+            self._invalidate_user(user_tg_id)
 
     # ==================== TEXT ITEMS OPERATIONS ====================
 
     async def get_text_items_by_name(
         self, unique_names: List[str], language_code: str = "ru"
     ) -> Dict[str, str]:
+        items = await self.text_loader.load_many(
+            (unique_name, language_code) for unique_name in unique_names
+        )
+        return {unique_name: content for (unique_name, _), content in items.items()}
+
+    async def _load_text_items(
+        self, keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        """Batch function of ``text_loader``: one query for all requested texts."""
+        if self.fast_path:
+            return await self.fast_path.get_text_items(keys)
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(
+                    TextItem.unique_name, TextItem.language_code, TextItem.content
+                ).where(tuple_(TextItem.unique_name, TextItem.language_code).in_(keys))
+            )
+            return {
+                (unique_name, language_code): content
+                for unique_name, language_code, content in result
+            }
+
+    async def get_all_text_items(self) -> Dict[Tuple[str, str], str]:
+        """Return the whole text catalog keyed by (unique_name, language_code)."""
         async with self.sessionmaker() as session:
             result = await session.execute(
-                select(TextItem).where(
-                    TextItem.unique_name.in_(unique_names),
-                    TextItem.language_code == language_code,
-                )
+                select(TextItem.unique_name, TextItem.language_code, TextItem.content)
             )
-            text_items = result.scalars().all()
-            return {item.unique_name: item.content for item in text_items}
+            return {
+                (unique_name, language_code): content
+                for unique_name, language_code, content in result.all()
+            }
 
     async def set_text_item(
         self, unique_name: str, language_code: str, content: str
@@ -297,6 +689,8 @@ class DatabaseHandler:
 
                 await session.commit()
                 await session.refresh(text_item)
+                self.text_loader.forget((unique_name, language_code))
+                self.text_cache.set(unique_name, language_code, content)
                 return text_item
 
     # ==================== APP CONFIG OPERATIONS ====================
@@ -350,50 +744,43 @@ class DatabaseHandler:
                 return config
 
     # ==================== CURRENCY OPERATIONS ====================
-    async def get_currencies(self) -> List[Currency]:
-        async with self.sessionmaker() as session:
-            result = await session.execute(select(Currency))
-            return result.scalars().all()
+    async def get_currencies(self) -> List[CurrencyView]:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(select(*CURRENCY_COLUMNS).order_by(Currency.id))
+            return [CurrencyView(*row) for row in result]
 
-    async def get_currency_by_symbol(self, symbol: str) -> Optional[Currency]:
-        async with self.sessionmaker() as session:
-            result = await session.execute(
-                select(Currency).where(Currency.symbol == symbol)
+    async def get_currency_by_symbol(self, symbol: str) -> Optional[CurrencyView]:
+        if self.fast_path:
+            return await self.fast_path.get_currency_by_symbol(symbol)
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(*CURRENCY_COLUMNS).where(Currency.symbol == symbol)
             )
-            return result.scalar_one_or_none()
+            row = result.first()
+        return CurrencyView(*row) if row is not None else None
 
     # ==================== CURRENCY PAIR OPERATIONS ====================
-    async def get_currency_pairs(self) -> List[CurrencyPair]:
-        """Get all active currency pairs with pre-loaded relationships"""
-        async with self.sessionmaker() as session:
-            from sqlalchemy.orm import joinedload
-
-            result = await session.execute(
-                select(CurrencyPair)
-                .options(
-                    joinedload(CurrencyPair.from_currency),
-                    joinedload(CurrencyPair.to_currency),
-                )
-                .where(CurrencyPair.is_active == True)
-            )
-            return result.scalars().all()
+    async def get_currency_pairs(self, only_active: bool = True) -> List[PairView]:
+        """Get currency pairs together with both currencies"""
+        stmt = _pairs_query().order_by(CurrencyPair.id)
+        if only_active:
+            stmt = stmt.where(CurrencyPair.is_active == True)
+        async with self.engine.connect() as conn:
+            result = await conn.execute(stmt)
+            return [_pair_view(row) for row in result]
 
     async def get_currency_pair(
         self, from_currency_symbol: str, to_currency_symbol: str
-    ) -> Optional[CurrencyPair]:
+    ) -> Optional[PairView]:
         """Get specific currency pair by currency symbols"""
-        async with self.sessionmaker() as session:
-            result = await session.execute(
-                select(CurrencyPair)
-                .join(CurrencyPair.from_currency)
-                .join(CurrencyPair.to_currency)
-                .where(
-                    Currency.symbol == from_currency_symbol,
-                    Currency.symbol == to_currency_symbol,
-                    CurrencyPair.is_active == True,
-                )
-            )
-            return result.scalar_one_or_none()
+        stmt = _pairs_query().where(
+            _FROM_CURRENCY.c.symbol == from_currency_symbol,
+            _TO_CURRENCY.c.symbol == to_currency_symbol,
+            CurrencyPair.is_active == True,
+        )
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(stmt)).first()
+        return _pair_view(row) if row is not None else None
 
     async def create_currency_pair(
         self, from_currency_symbol: str, to_currency_symbol: str, rate: Decimal
@@ -432,30 +819,141 @@ class DatabaseHandler:
                 session.add(pair)
                 await session.commit()
                 await session.refresh(pair)
-                return pair
+
+        await self.currency_cache.load(self)
+        return pair
 
     async def update_currency_pair_rate(
         self, from_currency_symbol: str, to_currency_symbol: str, rate: Decimal
     ) -> bool:
         """Update currency pair rate"""
-        async with self.sessionmaker() as session:
-            async with session.begin():
-                result = await session.execute(
-                    select(CurrencyPair)
-                    .join(CurrencyPair.from_currency)
-                    .join(CurrencyPair.to_currency)
-                    .where(
-                        Currency.symbol == from_currency_symbol,
-                        Currency.symbol == to_currency_symbol,
-                    )
-                )
-                pair = result.scalar_one_or_none()
+        key = (from_currency_symbol, to_currency_symbol)
+        changed = await self.update_currency_pair_rates({key: rate})
+        return key in changed or key in self.currency_cache.snapshot.pairs
+
+    async def update_currency_pair_rates(
+        self, rates: Dict[Tuple[str, str], Decimal]
+    ) -> Dict[Tuple[str, str], Decimal]:
+        """
+        Обновляет курсы многих пар одним UPDATE ... FROM (VALUES ...).
+
+        Rows whose rate is already equal are not touched. Returns the rates of the
+        pairs that really changed and pushes only them to the currency cache.
+        """
+        if not rates:
+            return {}
+        incoming = values(
+            column("from_symbol", String),
+            column("to_symbol", String),
+            column("rate", CurrencyPair.rate.type),
+            name="incoming",
+        ).data(
+            [
+                (from_symbol, to_symbol, rate)
+                for (from_symbol, to_symbol), rate in rates.items()
+            ]
+        )
+        stmt = (
+            update(CurrencyPair)
+            .where(
+                CurrencyPair.from_currency_id == _FROM_CURRENCY.c.id,
+                CurrencyPair.to_currency_id == _TO_CURRENCY.c.id,
+                _FROM_CURRENCY.c.symbol == incoming.c.from_symbol,
+                _TO_CURRENCY.c.symbol == incoming.c.to_symbol,
+                CurrencyPair.rate.is_distinct_from(incoming.c.rate),
+            )
+            .values(rate=incoming.c.rate)
+            .returning(
+                _FROM_CURRENCY.c.symbol, _TO_CURRENCY.c.symbol, CurrencyPair.rate
+            )
+        )
+        async with self.engine.begin() as conn:
+            result = await conn.execute(stmt)
+            changed = {
+                (from_symbol, to_symbol): rate
+                for from_symbol, to_symbol, rate in result
+            }
+
+        self.currency_cache.apply_rates(changed)
+        return changed
+
+    async def upsert_currency_pair_rates(
+        self, rates: Dict[Tuple[str, str], Decimal]
+    ) -> Dict[Tuple[str, str], Decimal]:
+        """
+        Записывает курсы любого количества пар одним INSERT ... ON CONFLICT.
+
+        Rates are passed as three arrays through ``unnest`` so the statement has
+        three parameters no matter how many pairs there are. Missing pairs are
+        created inactive. Returns the rates that were inserted or changed.
+        """
+        if not rates:
+            return {}
+        keys = list(rates)
+        rate_type = CurrencyPair.rate.type
+        incoming = (
+            func.unnest(
+                bindparam(
+                    "from_symbols",
+                    [from_symbol for from_symbol, _ in keys],
+                    type_=postgresql.ARRAY(String),
+                ),
+                bindparam(
+                    "to_symbols",
+                    [to_symbol for _, to_symbol in keys],
+                    type_=postgresql.ARRAY(String),
+                ),
+                bindparam(
+                    "rates", list(rates.values()), type_=postgresql.ARRAY(rate_type)
+                ),
+            )
+            .table_valued(
+                column("from_symbol", String),
+                column("to_symbol", String),
+                column("rate", rate_type),
+            )
+            .render_derived(name="incoming")
+        )
+        pairs = select(
+            _FROM_CURRENCY.c.id, _TO_CURRENCY.c.id, incoming.c.rate, false()
+        ).select_from(
+            incoming.join(
+                _FROM_CURRENCY, _FROM_CURRENCY.c.symbol == incoming.c.from_symbol
+            ).join(_TO_CURRENCY, _TO_CURRENCY.c.symbol == incoming.c.to_symbol)
+        )
+        stmt = insert(CurrencyPair).from_select(
+            ["from_currency_id", "to_currency_id", "rate", "is_active"], pairs
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CurrencyPair.from_currency_id, CurrencyPair.to_currency_id],
+            set_={"rate": stmt.excluded.rate, "updated_at": func.now()},
+            where=CurrencyPair.rate.is_distinct_from(stmt.excluded.rate),
+        ).returning(
+            CurrencyPair.from_currency_id,
+            CurrencyPair.to_currency_id,
+            CurrencyPair.rate,
+            literal_column("xmax = 0").label("inserted"),
+        )
+        async with self.engine.begin() as conn:
+            rows = (await conn.execute(stmt)).all()
 
-                if pair:
-                    pair.rate = rate
-                    await session.commit()
-                    return True
-                return False
+        symbols = {
+            currency.id: currency.symbol
+            for currency in self.currency_cache.snapshot.currencies.values()
+        }
+        changed = {
+            (
+                symbols.get(row.from_currency_id),
+                symbols.get(row.to_currency_id),
+            ): row.rate
+            for row in rows
+        }
+        if any(row.inserted for row in rows) or any(None in key for key in changed):
+            # New pairs (or currencies) are not in the snapshot yet
+            await self.currency_cache.load(self)
+        else:
+            self.currency_cache.apply_rates(changed)
+        return changed
 
     async def create_default_currency_pairs(self) -> None:
         """Create default currency pairs for KZT and RUB"""
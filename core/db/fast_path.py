@@ -0,0 +1,75 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.db.tables import Currency, User
+from core.db.views import CurrencyView, UserView, view_columns
+
+
+def _columns(view: type, table: Table) -> str:
+    return ", ".join(column.name for column in view_columns(view, table))
+
+
+# name -> SQL of the named prepared statements used by the fast path
+STATEMENTS = {
+    "get_users": (
+        f"SELECT {_columns(UserView, User.__table__)} FROM users "
+        "WHERE user_tg_id = ANY($1::bigint[])"
+    ),
+    "get_text_items": (
+        "SELECT unique_name, language_code, content FROM text_items "
+        "WHERE (unique_name, language_code) IN "
+        "(SELECT * FROM unnest($1::varchar[], $2::varchar[]))"
+    ),
+    "get_currency_by_symbol": (
+        f"SELECT {_columns(CurrencyView, Currency.__table__)} FROM currencies WHERE symbol = $1"
+    ),
+}
+
+
+class FastPath:
+    """
+    Runs the hottest index lookups directly on the engine's asyncpg
+    connections, skipping the ORM session, identity map and result objects.
+
+    Every pooled connection prepares each statement once under a fixed name and
+    keeps it in the connection record's ``info`` dict for its lifetime.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    @asynccontextmanager
+    async def _prepared(self, name: str) -> AsyncIterator[Any]:
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            statements: Dict[str, Any] = raw.info.setdefault("fast_path", {})
+            statement = statements.get(name)
+            if statement is None:
+                statement = await raw.driver_connection.prepare(
+                    STATEMENTS[name], name=f"fast_path_{name}"
+                )
+                statements[name] = statement
+            yield statement
+
+    async def get_users(self, user_tg_ids: List[int]) -> Dict[int, UserView]:
+        async with self._prepared("get_users") as statement:
+            rows = await statement.fetch(list(user_tg_ids))
+        return {row["user_tg_id"]: UserView(*row) for row in rows}
+
+    async def get_text_items(
+        self, keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        names, language_codes = zip(*keys) if keys else ((), ())
+        async with self._prepared("get_text_items") as statement:
+            rows = await statement.fetch(list(names), list(language_codes))
+        return {
+            (row["unique_name"], row["language_code"]): row["content"] for row in rows
+        }
+
+    async def get_currency_by_symbol(self, symbol: str) -> Optional[CurrencyView]:
+        async with self._prepared("get_currency_by_symbol") as statement:
+            row = await statement.fetchrow(symbol)
+        return CurrencyView(*row) if row is not None else None
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import copy
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Set, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from core.db.database_handler import DatabaseHandler
+from core.db.tables import FSMState
+
+RecordKey = Tuple[int, int, int]
+
+
+@dataclass
+class _Record:
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+@dataclass
+class _Scope:
+    records: Dict[RecordKey, _Record] = field(default_factory=dict)
+    dirty: Set[RecordKey] = field(default_factory=set)
+
+
+_scope: ContextVar[Optional[_Scope]] = ContextVar("fsm_storage_scope", default=None)
+
+
+class DatabaseStorage(BaseStorage):
+    """
+    FSM storage backed by the ``fsm_state`` table.
+
+    ``StorageFlushMiddleware`` wraps every update in :meth:`scope`. Within it a
+    record is read from the database once and writes only touch the local copy;
+    at the end all changed records are written with one UPSERT, so
+    ``set_state`` + several ``update_data`` calls in one handler cost a single
+    statement. Nothing is kept between updates: another replica may have changed
+    the record meanwhile. Cleared records (no state, no data) are deleted.
+    Outside of a scope every call reads and writes through.
+    """
+
+    def __init__(self, db: DatabaseHandler):
+        self.db = db
+
+    @staticmethod
+    def _key(key: StorageKey) -> RecordKey:
+        return key.bot_id, key.chat_id, key.user_id
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator[None]:
+        """Share records between the calls made while handling one update."""
+        if _scope.get() is not None:
+            yield
+            return
+        scope = _Scope()
+        token = _scope.set(scope)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+            await self._flush(scope)
+
+    async def _get_record(self, scope: _Scope, key: StorageKey) -> _Record:
+        record_key = self._key(key)
+        record = scope.records.get(record_key)
+        if record is not None:
+            return record
+
+        async with self.db.engine.connect() as conn:
+            row = (
+                await conn.execute(
+                    select(FSMState.state, FSMState.data).where(
+                        FSMState.bot_id == key.bot_id,
+                        FSMState.chat_id == key.chat_id,
+                        FSMState.user_id == key.user_id,
+                    )
+                )
+            ).one_or_none()
+
+        record = _Record()
+        if row is not None:
+            record.state, record.data = row.state, row.data or {}
+        scope.records[record_key] = record
+        return record
+
+    async def _read(self, key: StorageKey) -> _Record:
+        return await self._get_record(_scope.get() or _Scope(), key)
+
+    async def _write(self, key: StorageKey, **values: Any) -> None:
+        scope = _scope.get()
+        current = scope or _Scope()
+        record = await self._get_record(current, key)
+        for name, value in values.items():
+            setattr(record, name, value)
+        current.dirty.add(self._key(key))
+        if scope is None:
+            await self._flush(current)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._write(key, state=state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._read(key)).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._write(key, data=copy.deepcopy(dict(data)))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return copy.deepcopy((await self._read(key)).data)
+
+    async def _flush(self, scope: _Scope) -> None:
+        """Write the changed records: one UPSERT, one DELETE for cleared ones."""
+        records = {key: scope.records[key] for key in scope.dirty}
+        scope.dirty = set()
+        if not records:
+            return
+        key_columns = [FSMState.bot_id, FSMState.chat_id, FSMState.user_id]
+        cleared = [key for key, record in records.items() if record.is_empty]
+        stored = [
+            {
+                "bot_id": bot_id,
+                "chat_id": chat_id,
+                "user_id": user_id,
+                "state": record.state,
+                "data": record.data,
+            }
+            for (bot_id, chat_id, user_id), record in records.items()
+            if not record.is_empty
+        ]
+        async with self.db.engine.begin() as conn:
+            if stored:
+                stmt = insert(FSMState).values(stored)
+                await conn.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=key_columns,
+                        set_={
+                            "state": stmt.excluded.state,
+                            "data": stmt.excluded.data,
+                            "updated_at": func.now(),
+                        },
+                    )
+                )
+            if cleared:
+                await conn.execute(
+                    delete(FSMState).where(tuple_(*key_columns).in_(cleared))
+                )
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,125 @@
+import asyncio
+from typing import Callable, Dict, Optional
+
+import asyncpg
+from loguru import logger
+from sqlalchemy.engine import make_url
+
+USER_CHANGES_CHANNEL = "user_changes"
+CATALOG_CHANGES_CHANNEL = "catalog_changes"
+
+# Every write to users, by any process (bot replicas, admin panel, psql),
+# sends the changed user_tg_id to USER_CHANGES_CHANNEL
+USER_CHANGES_TRIGGER = [
+    "CREATE OR REPLACE FUNCTION notify_user_change() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_OP = 'DELETE' THEN "
+    f"PERFORM pg_notify('{USER_CHANGES_CHANNEL}', CAST(OLD.user_tg_id AS text)); "
+    "ELSE "
+    f"PERFORM pg_notify('{USER_CHANGES_CHANNEL}', CAST(NEW.user_tg_id AS text)); "
+    "END IF; "
+    "RETURN NULL; "
+    "END; $$ LANGUAGE plpgsql",
+    "DROP TRIGGER IF EXISTS users_notify_change ON users",
+    "CREATE TRIGGER users_notify_change AFTER UPDATE OR DELETE ON users "
+    "FOR EACH ROW EXECUTE FUNCTION notify_user_change()",
+]
+
+# Reference tables cached by every process; one notification per statement
+# with the table name as payload (Postgres folds duplicates within a transaction)
+CATALOG_TABLES = ["currencies", "currency_pairs", "payment_categories"]
+CATALOG_CHANGES_TRIGGER = [
+    "CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$ "
+    "BEGIN "
+    f"PERFORM pg_notify('{CATALOG_CHANGES_CHANNEL}', TG_TABLE_NAME); "
+    "RETURN NULL; "
+    "END; $$ LANGUAGE plpgsql",
+    *(
+        statement
+        for table in CATALOG_TABLES
+        for statement in (
+            f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}",
+            f"CREATE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change()",
+        )
+    ),
+]
+
+
+class ChangeListener:
+    """
+    Keeps the in-memory caches coherent with writes made outside of this process.
+
+    Holds one dedicated connection that LISTENs to every channel of ``handlers``
+    and passes each notification payload to the channel's handler. While the
+    connection is down changes can be missed, so ``on_coherence`` is called with
+    ``False``; it is called with ``True`` once listening again, and the caches
+    must reload whatever they could have missed.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        handlers: Dict[str, Callable[[str], None]],
+        on_coherence: Callable[[bool], None],
+        keepalive: float = 30.0,
+        retry_interval: float = 5.0,
+    ):
+        # asyncpg does not understand SQLAlchemy's "+asyncpg" driver suffix
+        self.dsn = (
+            make_url(url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self.handlers = handlers
+        self.on_coherence = on_coherence
+        self.keepalive = keepalive
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            self.handlers[channel](payload)
+        except Exception as e:
+            logger.warning(f"Failed to handle {channel} payload {payload!r}: {e}")
+
+    async def _run(self) -> None:
+        channels = ", ".join(self.handlers)
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                for channel in self.handlers:
+                    await connection.add_listener(channel, self._on_notification)
+                self.on_coherence(True)
+                logger.info(f"Listening to {channels}")
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.keepalive)
+                    except asyncio.TimeoutError:
+                        # A half-open TCP connection is only noticed on use
+                        await connection.fetchval("SELECT 1")
+                logger.warning(f"{channels} connection lost")
+            except Exception as e:
+                logger.warning(f"{channels} listener failed: {e}")
+            finally:
+                self.on_coherence(False)
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(self.retry_interval)
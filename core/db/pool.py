@@ -0,0 +1,64 @@
+import bisect
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+# Upper bounds of the checkout wait histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolStats:
+    """Counters collected by :class:`InstrumentedPool`."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_events = 0
+        self.max_wait_ms = 0.0
+        # last bucket counts waits above the largest bound
+        self.wait_histogram: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.wait_histogram[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that measures checkout wait time and overflow usage."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        overflow_before = self.overflow()
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.observe_wait((time.perf_counter() - started_at) * 1000)
+        if self.overflow() > max(overflow_before, 0):
+            self.stats.overflow_events += 1
+        return connection
+
+    def report(self) -> Dict[str, Any]:
+        histogram = {
+            f"<={bound}ms": count
+            for bound, count in zip(WAIT_BUCKETS_MS, self.stats.wait_histogram)
+        }
+        histogram[f">{WAIT_BUCKETS_MS[-1]}ms"] = self.stats.wait_histogram[-1]
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.stats.checkouts,
+            "timeouts": self.stats.timeouts,
+            "overflow_events": self.stats.overflow_events,
+            "max_wait_ms": round(self.stats.max_wait_ms, 2),
+            "wait_histogram": histogram,
+        }
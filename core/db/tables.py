@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy import (
     BigInteger,
@@ -11,9 +11,11 @@ from sqlalchemy import (
     Numeric,
     String,
     Text,
+    false,
     func,
     ForeignKey,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -98,6 +100,10 @@ class User(Base):
     is_agreed_with_terms: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )
+    # The user blocked the bot, broadcasts skip them until they write again
+    is_blocked: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
 
 
 class Currency(Base):
@@ -163,3 +169,59 @@ class PaymentCategory(Base):
         String(10), nullable=False, default="ru", index=True
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+
+class FSMState(Base):
+    __tablename__ = "fsm_state"
+    __table_args__ = (
+        Index("idx_fsm_state_key", "bot_id", "chat_id", "user_id", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    bot_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    state: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    data: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class ExchangeOrder(Base):
+    __tablename__ = "exchange_orders"
+    __table_args__ = (
+        Index("idx_exchange_orders_user_created", "user_tg_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_tg_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 6), nullable=False)
+    currency_from: Mapped[str] = mapped_column(String(10), nullable=False)
+    currency_to: Mapped[str] = mapped_column(String(10), nullable=False)
+    account_number: Mapped[str] = mapped_column(String(64), nullable=False)
+    bank: Mapped[str] = mapped_column(String(255), nullable=False)
+    receiver: Mapped[str] = mapped_column(String(255), nullable=False)
+    rate: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 8), nullable=True)
+    converted_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(18, 6), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False, index=True
+    )
+
+
+class PaymentOrder(Base):
+    __tablename__ = "payment_orders"
+    __table_args__ = (
+        Index("idx_payment_orders_user_created", "user_tg_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_tg_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    category: Mapped[str] = mapped_column(String(255), nullable=False)
+    amount_with_currency: Mapped[str] = mapped_column(String(255), nullable=False)
+    link: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False, index=True
+    )
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Type
+
+from sqlalchemy import ColumnElement, FromClause
+
+# Read models returned by DatabaseHandler read methods instead of ORM entities.
+# Fields are declared in the same order as the columns selected for them, so a
+# view is built positionally straight from a Core row: ``UserView(*row)``.
+
+
+@dataclass(frozen=True, slots=True)
+class UserView:
+    id: int
+    user_tg_id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    language: str
+    created_at: datetime
+    updated_at: datetime
+    is_admin: bool
+    is_banned: bool
+    is_agreed_with_terms: bool
+    is_blocked: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CurrencyView:
+    id: int
+    name: str
+    symbol: str
+    rate: Decimal
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class PairView:
+    id: int
+    from_currency_id: int
+    to_currency_id: int
+    rate: Decimal
+    is_active: bool
+    from_currency: CurrencyView
+    to_currency: CurrencyView
+
+
+def view_columns(view: Type[Any], table: FromClause) -> List[ColumnElement]:
+    """Columns of ``table`` in the field order of ``view`` (nested views skipped)."""
+    return [table.c[field.name] for field in fields(view) if field.name in table.c]
@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from core.db.fsm_storage import DatabaseStorage
+
+
+class StorageFlushMiddleware(BaseMiddleware):
+    """Write FSM changes made while handling an update in one go at its end."""
+
+    def __init__(self, storage: DatabaseStorage):
+        super().__init__()
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with self.storage.scope():
+            return await handler(event, data)
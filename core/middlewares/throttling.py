@@ -1,43 +1,113 @@
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 
+# event type -> (tokens refilled per second, bucket capacity)
+DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "message": (1.0, 3.0),
+    "callback_query": (2.0, 5.0),
+}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at", "notified")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.notified = False
+
 
 class ThrottlingMiddleware(BaseMiddleware):
-    def __init__(self, rate_limit=1.0, key_prefix="antiflood_"):
+    """
+    Token-bucket rate limiter per user and event type.
+
+    Buckets are kept in LRU order per event type. Buckets idle for longer than
+    ``idle_ttl`` are dropped and there are never more than ``max_size`` of them,
+    so memory does not grow with the number of users who ever wrote to the bot.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+        idle_ttl: float = 600.0,
+        max_size: int = 100_000,
+    ):
         super().__init__()
-        self.rate_limit = rate_limit
-        self.prefix = key_prefix
-        self.cache = defaultdict(float)
+        self.budgets = budgets or DEFAULT_BUDGETS
+        self.idle_ttl = idle_ttl
+        self.max_size = max_size
+        self.buckets: Dict[str, OrderedDict[int, _Bucket]] = {
+            event_type: OrderedDict() for event_type in self.budgets
+        }
+
+    def _evict(self, buckets: OrderedDict, now: float) -> None:
+        while len(buckets) > self.max_size:
+            buckets.popitem(last=False)
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if now - oldest.updated_at < self.idle_ttl:
+                break
+            buckets.popitem(last=False)
+
+    def _consume(self, event_type: str, user_id: int, now: float) -> Optional[_Bucket]:
+        """Take one token. Return the bucket if the event must be throttled."""
+        rate, capacity = self.budgets[event_type]
+        buckets = self.buckets[event_type]
+
+        bucket = buckets.get(user_id)
+        if bucket is None:
+            bucket = _Bucket(capacity, now)
+            buckets[user_id] = bucket
+        else:
+            buckets.move_to_end(user_id)
+            bucket.tokens = min(
+                capacity, bucket.tokens + (now - bucket.updated_at) * rate
+            )
+            bucket.updated_at = now
+        self._evict(buckets, now)
+
+        if bucket.tokens < 1.0:
+            return bucket
+        bucket.tokens -= 1.0
+        bucket.notified = False
+        return None
 
     async def __call__(self, handler, event, data):
         if isinstance(event, Message):
-            user_id = event.from_user.id
+            event_type = "message"
         elif isinstance(event, CallbackQuery):
-            user_id = event.from_user.id
+            event_type = "callback_query"
         else:
             return await handler(event, data)
 
-        current_time = time.time()
+        if event.from_user is None or event_type not in self.budgets:
+            return await handler(event, data)
 
-        key = f"{self.prefix}{user_id}"
+        bucket = self._consume(event_type, event.from_user.id, time.monotonic())
+        if bucket is None:
+            return await handler(event, data)
 
-        delta = current_time - self.cache[key]
+        # Warn once per throttled streak instead of answering every event
+        if bucket.notified:
+            if isinstance(event, CallbackQuery):
+                # Still answered, otherwise the button keeps spinning
+                return event.answer()
+            return False
+        bucket.notified = True
 
         text = (
             "Пожалуйста, не отправляйте сообщения слишком часто."
             if event.from_user.language_code == "ru"
             else "Please do not send messages too frequently."
         )
-
-        if delta < self.rate_limit:
-            if isinstance(event, Message):
-                await event.answer(text)
-            elif isinstance(event, CallbackQuery):
-                await event.answer(text, show_alert=True)
-            return False
-        else:
-            self.cache[key] = current_time
-            return await handler(event, data)
+        if isinstance(event, Message):
+            await event.answer(text)
+        elif isinstance(event, CallbackQuery):
+            # Returned instead of awaited, so in webhook mode the alert
+            # goes back in the webhook response
+            return event.answer(text, show_alert=True)
+        return False
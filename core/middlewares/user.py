@@ -0,0 +1,30 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject
+
+from core.db.database_handler import DatabaseHandler
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Load the user row once per update and pass it to handlers as ``user``.
+
+    Handlers that create the user themselves (e.g. /start) can opt out with
+    ``flags={"skip_user": True}``.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        if from_user is None or get_flag(data, "skip_user", default=False):
+            return await handler(event, data)
+
+        db: DatabaseHandler = data["db"]
+        data["user"] = await db.get_user(from_user.id)
+        return await handler(event, data)
@@ -0,0 +1,349 @@
+import asyncio
+import json
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from core.db.database_handler import DatabaseHandler
+from core.services.sender import Priority, SendScheduler
+
+BROADCAST_CHECKPOINT_KEY = "broadcast_checkpoint"
+BROADCAST_CANCEL_KEY = "broadcast_cancel"
+# pg_advisory_lock key held by the only process that sends the broadcast
+BROADCAST_LOCK_KEY = 0x62726F6164
+RETRY_DELAY = 5.0
+MAX_RETRY_DELAY = 60.0
+
+T = TypeVar("T")
+
+
+@dataclass
+class BroadcastProgress:
+    text: str
+    admin_chat_id: int
+    id: str = field(default_factory=lambda: secrets.token_hex(8))
+    last_id: int = 0
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    started_at: float = field(default_factory=time.time)
+    # Time spent sending, without restarts and retries of failed database calls
+    active_seconds: float = 0.0
+    finished: bool = False
+
+    def throughput(self) -> float:
+        """Messages sent per second of active sending."""
+        if self.active_seconds <= 0:
+            return 0.0
+        return self.sent / self.active_seconds
+
+    def summary(self) -> str:
+        return (
+            f"sent: {self.sent}, failed: {self.failed}, blocked: {self.blocked}, "
+            f"{self.throughput():.1f} msg/s, last user id: {self.last_id}"
+        )
+
+
+class Broadcaster:
+    """
+    Sends one text to every user who is not banned and has not blocked the bot.
+
+    Recipients are read page by page with keyset pagination on ``users.id`` and
+    queued in :class:`SendScheduler` with ``Priority.BULK``, so the global flood
+    limit is respected and user-facing calls always go first. After every page
+    the progress is checkpointed in ``app_config``; after a restart the broadcast
+    resumes from the last finished page (its recipients may get the message
+    twice, never zero times). Users that blocked the bot are marked and skipped
+    by later broadcasts. Failed database calls are retried with a growing delay,
+    so the broadcast only ends when every page is sent or it is cancelled.
+
+    With several processes only the one holding the ``BROADCAST_LOCK_KEY``
+    advisory lock sends; the others wait for the lock and take over an
+    unfinished broadcast if the holder goes away. A cancel made in another
+    process is requested through ``BROADCAST_CANCEL_KEY`` and noticed by the
+    holder before its next page.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseHandler,
+        send_scheduler: SendScheduler,
+        page_size: int = 100,
+        lock_retry_interval: float = 30.0,
+    ):
+        self.db = db
+        self.send_scheduler = send_scheduler
+        self.page_size = page_size
+        self.lock_retry_interval = lock_retry_interval
+        self.progress: Optional[BroadcastProgress] = None
+        self._pending: List[asyncio.Future] = []
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[AsyncConnection] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_sending(self) -> bool:
+        """This process holds the lock and sends the broadcast."""
+        return self.is_running and self._lock is not None
+
+    async def status(self) -> Optional[str]:
+        """
+        ``"running"``, ``"finished"`` or ``"interrupted"`` for the last broadcast
+        of any process, ``None`` if there was none. Refreshes :attr:`progress`.
+        """
+        if not self.is_sending:
+            self.progress = await self._load_checkpoint() or self.progress
+        if self.progress is None:
+            return None
+        if self.progress.finished:
+            return "finished"
+        if self.is_sending or not await self._try_lock(release=True):
+            return "running"
+        return "interrupted"
+
+    async def start(self, text: str, admin_chat_id: int) -> bool:
+        """
+        Start a new broadcast; ``False`` if another one is running in any process
+        or was interrupted and not cancelled.
+        """
+        if self.is_running or not await self._acquire():
+            return False
+        try:
+            stored = await self._load_checkpoint()
+            if stored is not None and not stored.finished:
+                self.progress = stored
+                await self._release()
+                return False
+            self.progress = BroadcastProgress(text=text, admin_chat_id=admin_chat_id)
+            await self._checkpoint()
+        except BaseException:
+            await self._release()
+            raise
+        self._spawn()
+        return True
+
+    async def resume(self) -> None:
+        """
+        Continue a broadcast interrupted by a restart, if there is one, once no
+        other process is sending it.
+        """
+        if self.is_running:
+            return
+        progress = await self._load_checkpoint()
+        if progress is None or progress.finished:
+            return
+        self.progress = progress
+        logger.info(f"Resuming broadcast after user id {progress.last_id}")
+        self._spawn()
+
+    async def cancel(self) -> bool:
+        """
+        Stop the broadcast for good; it will not be resumed. ``False`` if there
+        was nothing to cancel.
+        """
+        await self.stop()
+        stored = await self._load_checkpoint()
+        if stored is None or stored.finished:
+            return False
+        if self.progress is None or self.progress.id != stored.id:
+            self.progress = stored
+        if not await self._try_lock(release=True):
+            # Sent by another process, which stops before its next page
+            await self.db.set_config(
+                BROADCAST_CANCEL_KEY,
+                stored.id,
+                description="Отмененная рассылка",
+                description_en="Cancelled broadcast",
+            )
+            return True
+        self.progress.finished = True
+        await self._checkpoint()
+        return True
+
+    async def stop(self) -> None:
+        """Stop sending but keep the checkpoint so the next start resumes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+        await self._release()
+
+    def _spawn(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _load_checkpoint(self) -> Optional[BroadcastProgress]:
+        raw = await self.db.get_config(BROADCAST_CHECKPOINT_KEY)
+        return BroadcastProgress(**json.loads(raw)) if raw else None
+
+    async def _checkpoint(self) -> None:
+        await self.db.set_config(
+            BROADCAST_CHECKPOINT_KEY,
+            json.dumps(asdict(self.progress), ensure_ascii=False),
+            description="Прогресс текущей рассылки",
+            description_en="Progress of the current broadcast",
+        )
+
+    async def _acquire(self) -> bool:
+        """Take the advisory lock on a connection kept until :meth:`_release`."""
+        if self._lock is not None:
+            return True
+        # Autocommit: the connection may be held for hours, not in a transaction
+        conn = await self.db.autocommit_engine.connect()
+        try:
+            locked = await conn.scalar(
+                select(func.pg_try_advisory_lock(BROADCAST_LOCK_KEY))
+            )
+        except BaseException:
+            await conn.close()
+            raise
+        if not locked:
+            await conn.close()
+            return False
+        self._lock = conn
+        return True
+
+    async def _release(self) -> None:
+        if self._lock is None:
+            return
+        conn, self._lock = self._lock, None
+        try:
+            await conn.scalar(select(func.pg_advisory_unlock(BROADCAST_LOCK_KEY)))
+        except Exception as e:
+            # A pooled connection must not keep the lock
+            logger.warning(f"Failed to release the broadcast lock: {e}")
+            await conn.invalidate()
+        finally:
+            await conn.close()
+
+    async def _try_lock(self, release: bool) -> bool:
+        """Whether nobody else holds the lock; if ``release``, do not keep it."""
+        if self._lock is not None:
+            return True
+        acquired = await self._acquire()
+        if acquired and release:
+            await self._release()
+        return acquired
+
+    async def _is_lock_alive(self) -> bool:
+        try:
+            await self._lock.scalar(select(1))
+            return True
+        except Exception as e:
+            logger.error(f"Broadcast lock connection lost: {e}")
+            await self._release()
+            return False
+
+    async def _retry(self, action: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Await ``call()`` until it succeeds, backing off after every failure."""
+        delay = RETRY_DELAY
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                logger.error(
+                    f"Broadcast failed to {action}, retry in {delay:.0f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    async def _take_over(self) -> bool:
+        """
+        Wait for the lock and load the checkpoint; ``False`` if there is nothing
+        left to send.
+        """
+        if self._lock is None:
+            while not await self._retry("take the broadcast lock", self._acquire):
+                await asyncio.sleep(self.lock_retry_interval)
+            # The previous holder may have made progress or finished meanwhile
+            stored = await self._retry("read the checkpoint", self._load_checkpoint)
+            if stored is None:
+                return False
+            self.progress = stored
+        return not self.progress.finished
+
+    async def _run(self) -> None:
+        try:
+            while await self._take_over():
+                if await self._send_pages():
+                    break
+        finally:
+            await self._release()
+
+    async def _send_pages(self) -> bool:
+        """Send the remaining pages; ``False`` if the lock was lost on the way."""
+        progress = self.progress
+        while True:
+            if not await self._is_lock_alive():
+                return False
+            cancelled = await self._retry(
+                "read the cancel request",
+                lambda: self.db.get_config(BROADCAST_CANCEL_KEY),
+            )
+            if cancelled == progress.id:
+                logger.info(f"Broadcast cancelled: {progress.summary()}")
+                progress.finished = True
+                await self._retry("save the checkpoint", self._checkpoint)
+                return True
+            recipients = await self._retry(
+                "read recipients",
+                lambda: self.db.get_broadcast_recipients(
+                    after_id=progress.last_id, limit=self.page_size
+                ),
+            )
+            if not recipients:
+                break
+            active_since = time.monotonic()
+            self._pending = [
+                self.send_scheduler.submit(
+                    SendMessage(chat_id=user_tg_id, text=progress.text),
+                    Priority.BULK,
+                    log_failures=False,
+                )
+                for _, user_tg_id in recipients
+            ]
+            results = await asyncio.gather(*self._pending, return_exceptions=True)
+            self._pending = []
+
+            blocked = []
+            for (_, user_tg_id), result in zip(recipients, results):
+                if isinstance(result, TelegramForbiddenError):
+                    blocked.append(user_tg_id)
+                elif isinstance(result, BaseException):
+                    progress.failed += 1
+                else:
+                    progress.sent += 1
+            progress.blocked += len(blocked)
+            progress.last_id = recipients[-1][0]
+            progress.active_seconds += time.monotonic() - active_since
+            # The page is sent; retrying only the writes avoids sending it twice
+            await self._retry(
+                "mark blocked users", lambda: self.db.mark_users_blocked(blocked)
+            )
+            await self._retry("save the checkpoint", self._checkpoint)
+
+        progress.finished = True
+        await self._retry("save the checkpoint", self._checkpoint)
+        logger.info(f"Broadcast finished: {progress.summary()}")
+        self.send_scheduler.submit(
+            SendMessage(
+                chat_id=progress.admin_chat_id,
+                text=f"Broadcast finished, {progress.summary()}",
+            )
+        )
+        return True
@@ -1,37 +1,124 @@
 import asyncio
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from loguru import logger
 
+# Bot.delete_messages accepts at most 100 ids per call
+MAX_BATCH_SIZE = 100
 
-async def _delete_message(
-    bot: Bot,
-    chat_id: int,
-    message_id: int,
-) -> None:
-    """Helper function to delete a single message safely."""
-    for _ in range(3):
+
+class DeletionWorker:
+    """
+    Deletes messages in bulk with ``Bot.delete_messages``.
+
+    Every request becomes a timer in a heap. When the earliest timer fires, all
+    timers due within ``window`` seconds are merged per chat and sent in batches
+    of up to 100 ids. Only batches that really failed (flood control, network
+    errors) are retried; "message not found"-like errors are not.
+    """
+
+    def __init__(self, bot: Bot, window: float = 0.3, max_attempts: int = 3):
+        self.bot = bot
+        self.window = window
+        self.max_attempts = max_attempts
+        self._heap: List[Tuple[float, int, int, List[int], int]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def delete(self, chat_id: int, message_ids: List[int], delay: float = 0.0) -> None:
+        """Schedule deletion of messages in ``delay`` seconds."""
+        if not message_ids:
+            return
+        due = asyncio.get_running_loop().time() + max(delay, self.window)
+        self._push(due, chat_id, list(message_ids), 1)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker and delete everything still scheduled right away."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        batches: Dict[int, List[int]] = defaultdict(list)
+        for _, _, chat_id, message_ids, _ in self._heap:
+            batches[chat_id].extend(message_ids)
+        self._heap.clear()
+        await asyncio.gather(
+            *(
+                self._delete_batch(chat_id, message_ids[i : i + MAX_BATCH_SIZE], 0)
+                for chat_id, message_ids in batches.items()
+                for i in range(0, len(message_ids), MAX_BATCH_SIZE)
+            )
+        )
+
+    def _push(
+        self, due: float, chat_id: int, message_ids: List[int], attempt: int
+    ) -> None:
+        heapq.heappush(
+            self._heap, (due, next(self._counter), chat_id, message_ids, attempt)
+        )
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            timeout = self._heap[0][0] - loop.time()
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            horizon = loop.time() + self.window
+            batches: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+            while self._heap and self._heap[0][0] <= horizon:
+                _, _, chat_id, message_ids, attempt = heapq.heappop(self._heap)
+                batches[(chat_id, attempt)].extend(message_ids)
+
+            await asyncio.gather(
+                *(
+                    self._delete_batch(
+                        chat_id, message_ids[i : i + MAX_BATCH_SIZE], attempt
+                    )
+                    for (chat_id, attempt), message_ids in batches.items()
+                    for i in range(0, len(message_ids), MAX_BATCH_SIZE)
+                )
+            )
+
+    async def _delete_batch(
+        self, chat_id: int, message_ids: List[int], attempt: int
+    ) -> None:
+        loop = asyncio.get_running_loop()
         try:
-            await bot.delete_message(chat_id=chat_id, message_id=message_id)
-        except Exception:
-            await asyncio.sleep(0.5)
-
-
-async def safe_delete_messages(
-    bot: Bot,
-    chat_id: int,
-    message_ids: list[int],
-) -> None:
-    """Safely delete messages, ignoring errors if messages are already deleted."""
-    for message_id in message_ids:
-        asyncio.create_task(_delete_message(bot, chat_id, message_id))
-
-
-async def delayed_delete_messages(
-    bot: Bot,
-    chat_id: int,
-    message_ids: list[int],
-    delay: float = 2.0,
-) -> None:
-    """Delete messages after a specified delay."""
-    await asyncio.sleep(delay)
-    await safe_delete_messages(bot, chat_id, message_ids)
+            await self.bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+            return
+        except TelegramBadRequest:
+            # Messages are already deleted or too old, retrying won't help
+            return
+        except TelegramRetryAfter as e:
+            retry_in = e.retry_after
+        except Exception as e:
+            logger.warning(f"Failed to delete messages in chat {chat_id}: {e}")
+            retry_in = 0.5 * attempt
+
+        if 0 < attempt < self.max_attempts:
+            self._push(loop.time() + retry_in, chat_id, message_ids, attempt + 1)
@@ -0,0 +1,141 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from core.db.base import Base
+from core.db.database_handler import DatabaseHandler
+
+Row = Tuple[Type[Base], Dict[str, Any]]
+
+# Retrying these does not help, the row itself is bad
+NON_TRANSIENT_ERRORS = (DataError, IntegrityError)
+
+
+class OrderJournal:
+    """
+    Write-behind journal for order rows.
+
+    Handlers call :meth:`record` which only puts the row into a queue. A background
+    task collects rows for up to ``flush_interval`` seconds (or ``batch_size`` rows)
+    and writes them with one multi-row INSERT per table. If the INSERT fails because
+    of a bad row, the batch is written row by row so only that row is dropped.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseHandler,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        # ``None`` is the stop sentinel
+        self._queue: asyncio.Queue[Optional[Row]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def record(self, table: Type[Base], **values: Any) -> None:
+        """Queue a row for insertion; ``created_at`` is stamped now."""
+        values.setdefault("created_at", datetime.now(timezone.utc).replace(tzinfo=None))
+        self._queue.put_nowait((table, values))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Let the background task write everything queued so far, then stop it."""
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+        while not self._queue.empty():
+            await self._write(self._take_nowait())
+
+    def _take_nowait(self) -> List[Row]:
+        batch = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not None:
+                batch.append(row)
+        return batch
+
+    async def _collect(self) -> List[Row]:
+        batch = []
+        row = await self._queue.get()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while row is not None:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                return batch
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return batch
+            try:
+                row = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return batch
+        self._stopping = True
+        return batch
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            batch = await self._collect()
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[Row]) -> None:
+        rows_by_table: Dict[Type[Base], List[Dict[str, Any]]] = defaultdict(list)
+        for table, values in batch:
+            rows_by_table[table].append(values)
+
+        for table, rows in rows_by_table.items():
+            try:
+                await self._insert(table, rows)
+            except NON_TRANSIENT_ERRORS as e:
+                if len(rows) == 1:
+                    logger.error(f"Dropped {table.__tablename__} row {rows[0]}: {e}")
+                    continue
+                logger.warning(
+                    f"Failed to write {len(rows)} {table.__tablename__} rows, "
+                    f"writing them one by one: {e}"
+                )
+                for row in rows:
+                    try:
+                        await self._insert(table, [row])
+                    except NON_TRANSIENT_ERRORS as e:
+                        logger.error(f"Dropped {table.__tablename__} row {row}: {e}")
+
+    async def _insert(self, table: Type[Base], rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert ``rows`` in one statement, retrying transient errors.
+
+        Non-transient errors are raised at once; rows that still fail after
+        ``max_retries`` attempts are logged and dropped.
+        """
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.db.sessionmaker() as session:
+                    async with session.begin():
+                        await session.execute(insert(table).values(rows))
+                return
+            except NON_TRANSIENT_ERRORS:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Failed to write {len(rows)} {table.__tablename__} rows "
+                    f"(attempt {attempt}/{self.max_retries}): {e}"
+                )
+                if attempt == self.max_retries:
+                    logger.error(f"Dropped {table.__tablename__} rows: {rows}")
+                else:
+                    await asyncio.sleep(attempt)
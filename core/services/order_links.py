@@ -0,0 +1,40 @@
+import re
+import secrets
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.utils.deep_linking import create_start_link
+
+from core.db.database_handler import DatabaseHandler
+from core.services.orders import parse_order
+
+ORDER_LINK_CONFIG_PREFIX = "order_link:"
+# Telegram accepts at most 64 characters [A-Za-z0-9_-] in a /start payload,
+# too few for an order text, so the link carries a token and the text is stored
+ORDER_LINK_TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+async def create_order_link(bot: Bot, db: DatabaseHandler, text: str) -> str:
+    """
+    Store a one-shot order text and return a ``t.me/<bot>?start=<token>`` link
+    that opens its confirmation. Raises ``ValueError`` if the text is not a
+    valid order.
+    """
+    draft, errors = parse_order(text)
+    if draft is None:
+        raise ValueError(f"Invalid order text: {', '.join(errors)}")
+    token = secrets.token_urlsafe(16)
+    await db.set_config(
+        ORDER_LINK_CONFIG_PREFIX + token,
+        text.strip(),
+        description="Текст заявки для ссылки /start",
+        description_en="Order text behind a /start link",
+    )
+    return await create_start_link(bot, token)
+
+
+async def resolve_order_link(db: DatabaseHandler, payload: str) -> Optional[str]:
+    """Order text stored for a /start payload, ``None`` for unknown payloads."""
+    if not ORDER_LINK_TOKEN_PATTERN.match(payload):
+        return None
+    return await db.get_config(ORDER_LINK_CONFIG_PREFIX + payload)
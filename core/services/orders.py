@@ -0,0 +1,108 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+
+# exchange_orders.amount is Numeric(18, 6)
+MAX_AMOUNT = Decimal("1e12")
+
+AMOUNT_PATTERN = re.compile(r"^\d+(?:[.,]\d{1,6})?$")
+CURRENCY_PATTERN = re.compile(r"^[a-zA-Z]{2,10}$")
+# Phone number or card number
+ACCOUNT_NUMBER_PATTERN = re.compile(
+    r"^(?:" r"(?:\+?[\d\s\-()]{10,})|" r"(?:\d[\d\s\-]{13,})" r")$"
+)
+ACCOUNT_NUMBER_SEPARATORS = re.compile(r"[\s\-()]+")
+# exchange_orders.account_number is String(64)
+MAX_ACCOUNT_NUMBER_LENGTH = 64
+# "<amount> <from> <to>; <account number>; <bank>; <receiver>"
+ORDER_HEAD_PATTERN = re.compile(r"^\s*(\S+)\s+(\S+)\s+(\S+)\s*$")
+ORDER_SEPARATOR = ";"
+# exchange_orders.bank / receiver and payment_orders.amount_with_currency are
+# String(255); payment_orders.link is Text but ends up in a Telegram message
+MAX_TEXT_FIELD_LENGTH = 255
+MAX_LINK_LENGTH = 1024
+
+
+@dataclass(frozen=True)
+class OrderDraft:
+    """Exchange order fields parsed from a single message."""
+
+    amount: Decimal
+    currency_from: str
+    currency_to: str
+    account_number: str
+    bank: str
+    receiver: str
+
+
+def parse_amount(text: str) -> Optional[Decimal]:
+    text = text.strip()
+    if not AMOUNT_PATTERN.match(text):
+        return None
+    try:
+        amount = Decimal(text.replace(",", "."))
+    except InvalidOperation:
+        return None
+    if not 0 < amount < MAX_AMOUNT:
+        return None
+    return amount
+
+
+def parse_account_number(text: str) -> Optional[str]:
+    """Return the account number without separators, ``None`` if it is invalid."""
+    text = text.strip()
+    if not ACCOUNT_NUMBER_PATTERN.match(text):
+        return None
+    cleaned = ACCOUNT_NUMBER_SEPARATORS.sub("", text)
+    if not 10 <= len(cleaned) <= MAX_ACCOUNT_NUMBER_LENGTH:
+        return None
+    return cleaned
+
+
+def parse_text_field(
+    text: str, max_length: int = MAX_TEXT_FIELD_LENGTH
+) -> Optional[str]:
+    text = text.strip()
+    if not text or len(text) > max_length:
+        return None
+    return text
+
+
+def parse_order(text: str) -> Tuple[Optional[OrderDraft], List[str]]:
+    """
+    Parse ``<amount> <from> <to>; <account number>; <bank>; <receiver>``.
+
+    All fields are validated at once. Returns the draft or the unique names of
+    the texts describing every invalid field.
+    """
+    parts = text.split(ORDER_SEPARATOR)
+    head = ORDER_HEAD_PATTERN.match(parts[0])
+    if len(parts) != 4 or head is None:
+        return None, ["order_command_usage"]
+
+    errors = []
+    amount = parse_amount(head.group(1))
+    if amount is None:
+        errors.append("incorrect_amount")
+    currency_from, currency_to = head.group(2).lower(), head.group(3).lower()
+    if (
+        not CURRENCY_PATTERN.match(currency_from)
+        or not CURRENCY_PATTERN.match(currency_to)
+        or currency_from == currency_to
+    ):
+        errors.append("no_exchange_route")
+    account_number = parse_account_number(parts[1])
+    if account_number is None:
+        errors.append("invalid_account_number")
+    bank = parse_text_field(parts[2])
+    receiver = parse_text_field(parts[3])
+    if bank is None or receiver is None:
+        errors.append("order_command_usage")
+
+    if errors:
+        return None, errors
+    return (
+        OrderDraft(amount, currency_from, currency_to, account_number, bank, receiver),
+        [],
+    )
@@ -0,0 +1,170 @@
+import asyncio
+import math
+import secrets
+import time
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from loguru import logger
+
+from core.db.database_handler import DatabaseHandler
+
+# exchange_orders.rate is Numeric(18, 8), converted_amount is Numeric(18, 6)
+RATE_QUANTUM = Decimal("0.00000001")
+AMOUNT_QUANTUM = Decimal("0.01")
+# Quotes that do not fit those columns are not offered; the order goes unquoted
+MAX_CONVERTED_AMOUNT = Decimal("1e12")
+MAX_QUOTE_RATE = Decimal("1e10")
+
+
+def price(rate: Decimal, amount: Decimal) -> Tuple[Decimal, Decimal]:
+    """Return the quantized rate and the converted amount for ``amount``."""
+    rate = rate.quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP)
+    # Never promise more than the rate gives
+    return rate, (amount * rate).quantize(AMOUNT_QUANTUM, rounding=ROUND_DOWN)
+
+
+def format_rate(rate: Decimal) -> str:
+    """Rate without trailing zeros and without exponent: 500, not 5E+2."""
+    return f"{rate.normalize():f}"
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    id: str
+    from_symbol: str
+    to_symbol: str
+    amount: Decimal
+    rate: Decimal
+    converted_amount: Decimal
+    path: Tuple[str, ...]
+    expires_at: float
+
+    @property
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: ``slots`` buckets, one of them is processed every ``tick``.
+
+    Scheduling and cancelling are O(1); a timer longer than one revolution keeps
+    a rounds counter that is decremented every time its bucket comes up.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64):
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._index: Dict[Hashable, int] = {}
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def schedule(self, key: Hashable, delay: float) -> None:
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        rounds, offset = divmod(ticks - 1, len(self._slots))
+        slot = (self._cursor + 1 + offset) % len(self._slots)
+        self._slots[slot][key] = rounds
+        self._index[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        slot = self._index.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def advance(self) -> List[Hashable]:
+        """Move to the next bucket and return the keys that expired in it."""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+        expired = [key for key, rounds in bucket.items() if rounds == 0]
+        for key in expired:
+            del bucket[key]
+            del self._index[key]
+        for key in bucket:
+            bucket[key] -= 1
+        return expired
+
+
+class QuoteService:
+    """
+    Issues quotes for exchange orders and keeps them for ``ttl`` seconds.
+
+    The rate comes from ``db.route_table`` (direct pair or the best multi-hop
+    route), so quoting and re-quoting never touch the database. Expired quotes
+    are dropped by a single timer wheel task instead of one task per quote.
+    """
+
+    def __init__(self, db: DatabaseHandler, ttl: float = 300.0, tick: float = 1.0):
+        self.db = db
+        self.ttl = ttl
+        self._quotes: Dict[str, Quote] = {}
+        self._wheel = TimerWheel(tick=tick)
+        self._task: Optional[asyncio.Task] = None
+
+    def quote(
+        self, from_symbol: str, to_symbol: str, amount: Decimal
+    ) -> Optional[Quote]:
+        """
+        Lock the current rate for ``amount``; ``None`` if there is no route or
+        the result does not fit ``exchange_orders``.
+        """
+        route = self.db.route_table.get(from_symbol, to_symbol)
+        if route is None or route.rate >= MAX_QUOTE_RATE:
+            return None
+        rate, converted_amount = price(route.rate, amount)
+        if converted_amount >= MAX_CONVERTED_AMOUNT:
+            return None
+        quote = Quote(
+            id=secrets.token_urlsafe(8),
+            from_symbol=from_symbol,
+            to_symbol=to_symbol,
+            amount=amount,
+            rate=rate,
+            converted_amount=converted_amount,
+            path=route.path,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._quotes[quote.id] = quote
+        self._wheel.schedule(quote.id, self.ttl)
+        return quote
+
+    def get(self, quote_id: Optional[str]) -> Optional[Quote]:
+        """Return a quote that is still valid."""
+        quote = self._quotes.get(quote_id)
+        if quote is None or quote.is_expired:
+            return None
+        return quote
+
+    def consume(self, quote_id: Optional[str]) -> Optional[Quote]:
+        """Return a quote that is still valid and drop it, so it is used only once."""
+        quote = self.get(quote_id)
+        if quote is not None:
+            del self._quotes[quote_id]
+            self._wheel.cancel(quote_id)
+        return quote
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._wheel.tick)
+            expired = self._wheel.advance()
+            for quote_id in expired:
+                self._quotes.pop(quote_id, None)
+            if expired:
+                logger.debug(f"{len(expired)} quotes expired, {len(self._quotes)} left")
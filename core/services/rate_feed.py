@@ -0,0 +1,137 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+
+from loguru import logger
+
+from core.db.database_handler import DatabaseHandler
+from core.services.rate_providers import PairKey, RateProvider
+
+
+@dataclass
+class FeedStatus:
+    provider: str
+    last_attempt_at: Optional[float] = None
+    last_success_at: Optional[float] = None
+    last_error: Optional[str] = None
+    pairs_received: int = 0
+
+    def staleness(self, now: float) -> Optional[float]:
+        """Seconds since the last successful fetch, ``None`` if there was none."""
+        if self.last_success_at is None:
+            return None
+        return now - self.last_success_at
+
+
+class RateFeed:
+    """
+    Periodically pulls rates from the providers and applies the changed ones.
+
+    Providers are fetched concurrently; when several of them quote the same pair,
+    the one listed first wins. Incoming rates are diffed against the currency
+    snapshot and all changes are written with one ``UPDATE ... FROM (VALUES ...)``.
+    Pairs that do not exist in ``currency_pairs`` are ignored.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseHandler,
+        providers: List[RateProvider],
+        interval: float = 60.0,
+        max_staleness: float = 600.0,
+    ):
+        self.db = db
+        self.providers = providers
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.statuses = {
+            provider.name: FeedStatus(provider.name) for provider in providers
+        }
+        self.pairs_changed = 0
+        # Pairs of every provider's last successful fetch
+        self._quoted: Dict[str, Set[PairKey]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.providers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for provider in self.providers:
+            await provider.close()
+
+    @property
+    def quoted_pairs(self) -> Set[PairKey]:
+        """Pairs whose rate comes from a provider."""
+        return set().union(*self._quoted.values())
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "pairs_changed": self.pairs_changed,
+            "feeds": [
+                {**asdict(status), "staleness": status.staleness(now)}
+                for status in self.statuses.values()
+            ],
+        }
+
+    async def run_once(self) -> Dict[PairKey, Decimal]:
+        """Fetch all providers and apply the changes; return the changed rates."""
+        results = await asyncio.gather(
+            *(self._fetch(provider) for provider in self.providers)
+        )
+        incoming: Dict[PairKey, Decimal] = {}
+        for rates in reversed(results):
+            incoming.update(rates)
+
+        pairs = self.db.currency_cache.snapshot.pairs
+        changes = {
+            key: rate
+            for key, rate in incoming.items()
+            if key in pairs and pairs[key].rate != rate
+        }
+        if not changes:
+            return {}
+
+        changed = await self.db.update_currency_pair_rates(changes)
+        self.pairs_changed += len(changed)
+        logger.info(f"Rate feed applied {len(changed)} of {len(incoming)} rates")
+        return changed
+
+    async def _fetch(self, provider: RateProvider) -> Dict[PairKey, Decimal]:
+        status = self.statuses[provider.name]
+        status.last_attempt_at = time.time()
+        try:
+            rates = await provider.fetch()
+        except Exception as e:
+            status.last_error = f"{type(e).__name__}: {e}"
+            staleness = status.staleness(time.time())
+            if staleness is None or staleness > self.max_staleness:
+                logger.warning(
+                    f"Rate feed {provider.name} is stale "
+                    f"({'never fetched' if staleness is None else f'{staleness:.0f}s'}): "
+                    f"{status.last_error}"
+                )
+            return {}
+        status.last_success_at = status.last_attempt_at
+        status.last_error = None
+        status.pairs_received = len(rates)
+        self._quoted[provider.name] = set(rates)
+        return rates
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Rate feed ingestion failed: {e}")
+            await asyncio.sleep(self.interval)
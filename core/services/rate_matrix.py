@@ -0,0 +1,84 @@
+from decimal import ROUND_HALF_UP, Context, Decimal
+from typing import Collection, Dict, Iterable, List
+
+from loguru import logger
+
+from core.db.database_handler import DatabaseHandler
+from core.db.views import CurrencyView
+from core.services.rate_providers import MAX_RATE, RATE_QUANTUM, PairKey
+
+# Enough digits for an exact quotient before it is rounded to RATE_QUANTUM,
+# ROUND_HALF_UP is what PostgreSQL uses when casting to numeric
+_CONTEXT = Context(prec=34, rounding=ROUND_HALF_UP)
+
+
+class RateMatrix:
+    """
+    Cross rates of every currency against every other one.
+
+    Base rates are kept as one vector; the whole N x N matrix is derived from it
+    in a single pass (``rate[i][j] = base[i] / base[j]``) and quantized to the
+    ``currency_pairs.rate`` scale, so re-pricing needs no per-pair queries.
+    """
+
+    def __init__(self, symbols: List[str], base_rates: List[Decimal]):
+        if len(symbols) != len(base_rates):
+            raise ValueError("symbols and base_rates must have the same length")
+        self.symbols = symbols
+        self.base_rates = base_rates
+
+    @classmethod
+    def from_currencies(cls, currencies: Iterable[CurrencyView]) -> "RateMatrix":
+        """Build the base vector from active currencies with a positive rate."""
+        priced = [
+            currency
+            for currency in currencies
+            if currency.is_active and currency.rate > 0
+        ]
+        return cls(
+            [currency.symbol for currency in priced],
+            [currency.rate for currency in priced],
+        )
+
+    def compute(self) -> Dict[PairKey, Decimal]:
+        """Return quantized cross rates for all ordered pairs of distinct currencies."""
+        divide = _CONTEXT.divide
+        quantize = _CONTEXT.quantize
+        base_rates = self.base_rates
+        rates = {}
+        skipped = 0
+        for from_symbol, from_rate in zip(self.symbols, base_rates):
+            row = [
+                quantize(divide(from_rate, to_rate), RATE_QUANTUM)
+                for to_rate in base_rates
+            ]
+            for to_symbol, rate in zip(self.symbols, row):
+                if to_symbol == from_symbol:
+                    continue
+                if rate <= 0 or rate > MAX_RATE:
+                    skipped += 1
+                    continue
+                rates[(from_symbol, to_symbol)] = rate
+        if skipped:
+            logger.warning(f"{skipped} cross rates do not fit Numeric(10, 6), skipped")
+        return rates
+
+
+async def reprice_currency_pairs(
+    db: DatabaseHandler, exclude: Collection[PairKey] = ()
+) -> Dict[PairKey, Decimal]:
+    """
+    Recompute cross rates from the currencies' base rates and store them.
+
+    Currencies without a base rate (0) are skipped, and so are the pairs in
+    ``exclude``: rates quoted by the rate feed must not be overwritten.
+    """
+    matrix = RateMatrix.from_currencies(await db.get_currencies())
+    rates = {key: rate for key, rate in matrix.compute().items() if key not in exclude}
+    changed = await db.upsert_currency_pair_rates(rates)
+    logger.info(
+        f"Repriced {len(matrix.symbols)} currencies: "
+        f"{len(rates)} cross rates, {len(exclude)} feed pairs kept, "
+        f"{len(changed)} changed"
+    )
+    return changed
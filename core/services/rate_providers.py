@@ -0,0 +1,124 @@
+"""
+Sources of currency pair rates for :class:`core.services.rate_feed.RateFeed`.
+
+Every provider returns rates keyed by ``(from_symbol, to_symbol)``. The payload
+format shared by the file and HTTP providers is::
+
+    {"rates": {"kzt": {"rub": "0.19", "usdt": "0.0021"}, "rub": {...}}}
+
+Run a local HTTP stub serving a JSON file with the same format:
+
+    python -m core.services.rate_providers rates.json [port]
+"""
+
+import asyncio
+import json
+import sys
+from abc import ABC, abstractmethod
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+from loguru import logger
+
+PairKey = Tuple[str, str]
+
+# currency_pairs.rate is Numeric(10, 6)
+RATE_QUANTUM = Decimal("0.000001")
+MAX_RATE = Decimal("9999.999999")
+
+
+def parse_rates(payload: Dict[str, Any]) -> Dict[PairKey, Decimal]:
+    """
+    Convert a ``{"rates": {from: {to: rate}}}`` payload, skipping invalid rates
+    and rates that do not fit ``currency_pairs.rate``.
+    """
+    rates = {}
+    skipped = 0
+    for from_symbol, targets in payload.get("rates", {}).items():
+        for to_symbol, raw_rate in targets.items():
+            if from_symbol == to_symbol:
+                continue
+            try:
+                rate = Decimal(str(raw_rate))
+                if not rate.is_finite():
+                    raise ValueError
+                rate = rate.quantize(RATE_QUANTUM)
+            except (InvalidOperation, ValueError):
+                logger.warning(f"Invalid rate {from_symbol}/{to_symbol}: {raw_rate!r}")
+                continue
+            if rate <= 0 or rate > MAX_RATE:
+                skipped += 1
+                continue
+            rates[(from_symbol.lower(), to_symbol.lower())] = rate
+    if skipped:
+        logger.warning(f"{skipped} rates do not fit Numeric(10, 6), skipped")
+    return rates
+
+
+class RateProvider(ABC):
+    """Base class of rate sources."""
+
+    name: str = "provider"
+
+    @abstractmethod
+    async def fetch(self) -> Dict[PairKey, Decimal]:
+        """Return the current rates; raise if the source is unavailable."""
+
+    async def close(self) -> None:
+        pass
+
+
+class JsonFileRateProvider(RateProvider):
+    """Reads rates from a JSON file, e.g. one dropped by a cron job."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.name = f"file:{self.path.name}"
+
+    async def fetch(self) -> Dict[PairKey, Decimal]:
+        text = await asyncio.to_thread(self.path.read_text, encoding="utf-8")
+        return parse_rates(json.loads(text))
+
+
+class HttpRateProvider(RateProvider):
+    """Fetches rates from an HTTP endpoint returning the JSON payload."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.name = f"http:{url}"
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def fetch(self) -> Dict[PairKey, Decimal]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        async with self._session.get(self.url) as response:
+            response.raise_for_status()
+            return parse_rates(await response.json(content_type=None))
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def create_stub_app(path: str) -> web.Application:
+    """aiohttp app serving the rates file on ``GET /rates``, re-read on every call."""
+
+    async def rates_handler(request: web.Request) -> web.Response:
+        return web.json_response(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    app = web.Application()
+    app.router.add_get("/rates", rates_handler)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(
+        create_stub_app(sys.argv[1]),
+        host="127.0.0.1",
+        port=int(sys.argv[2]) if len(sys.argv) > 2 else 8081,
+    )
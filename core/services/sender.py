@@ -0,0 +1,265 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods.base import TelegramMethod
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Lower value is sent first."""
+
+    USER = 0  # edits and answers the user is waiting for
+    LEAD = 1  # posts to LEAD_CHAT
+    BULK = 2  # mass mailings
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
+class _Job:
+    __slots__ = ("method", "future", "chat_id")
+
+    def __init__(self, method: TelegramMethod, future: asyncio.Future):
+        self.method = method
+        self.future = future
+        self.chat_id = getattr(method, "chat_id", None)
+
+
+class SendScheduler:
+    """
+    Outbound queue for Bot API calls that respects Telegram flood limits.
+
+    Calls are sent in priority order through a global token bucket and a token
+    bucket per chat. On ``TelegramRetryAfter`` the chat (or the whole bot for
+    calls without a chat) is paused for ``retry_after`` seconds and the call is
+    queued again.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        group_rate: float = 1.0,
+        group_burst: float = 1.0,
+        idle_chat_ttl: float = 60.0,
+    ):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.idle_chat_ttl = idle_chat_ttl
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: Dict[Any, TokenBucket] = {}
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        method: TelegramMethod[T],
+        priority: Priority = Priority.USER,
+        log_failures: bool = True,
+    ) -> "asyncio.Future[T]":
+        """
+        Queue a Bot API call. The returned future may be ignored; errors are logged
+        unless ``log_failures`` is off and the caller checks the future itself.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if log_failures:
+            future.add_done_callback(self._log_failure)
+        self._push(priority, _Job(method, future))
+        return future
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Drop queued BULK calls and give USER and LEAD calls up to ``timeout``
+        seconds to be sent. Calls still queued after that are logged.
+        """
+        self._drop(lambda priority, job: priority == Priority.BULK)
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Send queue not drained in {timeout}s")
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in self._in_flight:
+            task.cancel()
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._drop(lambda priority, job: True)
+
+    async def _drain(self) -> None:
+        while self._heap or self._in_flight:
+            if self._in_flight:
+                await asyncio.wait(set(self._in_flight))
+            else:
+                # Waiting for a flood limit to let the next call through
+                await asyncio.sleep(0.1)
+
+    def _drop(self, predicate: Callable[[int, _Job], bool]) -> None:
+        kept = []
+        for priority, seq, job in self._heap:
+            if not predicate(priority, job):
+                kept.append((priority, seq, job))
+                continue
+            if priority == Priority.LEAD and not job.future.done():
+                logger.error(f"Undelivered lead chat post dropped: {job.method}")
+            job.future.cancel()
+        heapq.heapify(kept)
+        self._heap = kept
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Scheduled Bot API call failed: {future.exception()}")
+
+    def _push(self, priority: int, job: _Job) -> None:
+        heapq.heappush(self._heap, (priority, next(self._counter), job))
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = (
+                TokenBucket(self.group_rate, self.group_burst)
+                if is_group
+                else TokenBucket(self.chat_rate, self.chat_burst)
+            )
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _evict_idle_chats(self, now: float) -> None:
+        if len(self._chats) < 1024:
+            return
+        self._chats = {
+            chat_id: bucket
+            for chat_id, bucket in self._chats.items()
+            if now - bucket.updated_at < self.idle_chat_ttl
+            or now < bucket.blocked_until
+        }
+
+    def _pop_ready(self, now: float) -> Tuple[Optional[Tuple[int, _Job]], float]:
+        """
+        Pop the highest priority job whose chat can be sent to right now.
+        Otherwise return how long to wait for the earliest one.
+        """
+        skipped = []
+        ready = None
+        wait = float("inf")
+        while self._heap:
+            priority, seq, job = heapq.heappop(self._heap)
+            if job.future.cancelled():
+                continue
+            if job.chat_id is None:
+                job_wait = 0.0
+            else:
+                job_wait = self._chat_bucket(job.chat_id).wait_time(now)
+            if job_wait == 0.0:
+                ready = (priority, job)
+                break
+            wait = min(wait, job_wait)
+            skipped.append((priority, seq, job))
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return ready, wait
+
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            global_wait = self._global.wait_time(now)
+            if global_wait > 0:
+                await asyncio.sleep(global_wait)
+                continue
+
+            ready, wait = self._pop_ready(now)
+            if ready is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=None if wait == float("inf") else wait,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            priority, job = ready
+            self._global.take()
+            if job.chat_id is not None:
+                self._chat_bucket(job.chat_id).take()
+            self._evict_idle_chats(now)
+            task = asyncio.create_task(self._send(priority, job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, priority: int, job: _Job) -> None:
+        try:
+            result = await self.bot(job.method)
+        except TelegramRetryAfter as e:
+            logger.warning(
+                f"Flood control in chat {job.chat_id}, retry in {e.retry_after}s"
+            )
+            bucket = (
+                self._global if job.chat_id is None else self._chat_bucket(job.chat_id)
+            )
+            bucket.blocked_until = time.monotonic() + e.retry_after
+            self._push(priority, job)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
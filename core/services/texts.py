@@ -15,7 +15,12 @@ async def get_texts(
     :param db: Database handler instance.
     :return: Dictionary mapping unique names to their corresponding text content.
     """
-    texts = await db.get_text_items_by_name(unique_names, language_code)
+    text_cache = db.text_cache
+    if text_cache.is_loaded:
+        await text_cache.refresh(db)
+        texts = text_cache.get_many(unique_names, language_code)
+    else:
+        texts = await db.get_text_items_by_name(unique_names, language_code)
 
     missing_names = set(unique_names) - set(texts.keys())
 
@@ -1,10 +1,12 @@
 from aiogram.types import InlineKeyboardButton, WebAppInfo, InlineKeyboardMarkup
 
 from config import ADMIN_URL
+from core.caching.keyboards import cached_keyboard
 from core.db.database_handler import DatabaseHandler
 from core.services.texts import get_texts
 
 
+@cached_keyboard
 async def get_admin_panel_keyboard(
     language_code: str, db: DatabaseHandler
 ) -> InlineKeyboardMarkup:
@@ -1,10 +1,12 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
 
 from config import ADMIN_URL
+from core.caching.keyboards import cached_keyboard
 from core.db.database_handler import DatabaseHandler
 from core.services.texts import get_texts
 
 
+@cached_keyboard
 async def get_main_menu_keyboard(
     language_code: str, db: DatabaseHandler, is_admin: bool = False
 ) -> InlineKeyboardMarkup:
@@ -65,6 +67,7 @@ async def get_main_menu_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=keyboard_list)
 
 
+@cached_keyboard
 async def get_back_to_main_menu_keyboard(
     language_code: str, db: DatabaseHandler
 ) -> InlineKeyboardMarkup:
@@ -87,6 +90,7 @@ async def get_back_to_main_menu_keyboard(
     return keyboard
 
 
+@cached_keyboard
 async def get_settings_keyboard(
     language_code: str, db: DatabaseHandler
 ) -> InlineKeyboardMarkup:
@@ -112,6 +116,7 @@ async def get_settings_keyboard(
     return keyboard
 
 
+@cached_keyboard
 async def get_terms_of_service_keyboard(
     language_code: str, db: DatabaseHandler
 ) -> InlineKeyboardMarkup:
@@ -3,14 +3,16 @@ from typing import List
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from core.caching.keyboards import cached_keyboard
 from core.db.database_handler import DatabaseHandler
 from core.services.texts import get_texts
 
 
+@cached_keyboard
 async def get_currencies_keyboard(
     db: DatabaseHandler, exclude_currencies: List[str] = None
 ) -> InlineKeyboardMarkup:
-    currencies = await db.get_currencies()
+    currencies = db.currency_cache.snapshot.currencies.values()
     exclude_currencies = exclude_currencies or []
     currencies = [
         currency for currency in currencies if currency.symbol not in exclude_currencies
@@ -33,6 +35,7 @@ async def get_currencies_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=keyboard_list)
 
 
+@cached_keyboard
 async def get_order_final_keyboard(language: str, db: DatabaseHandler):
     texts = await get_texts(
         unique_names=["submit_button", "start_over_button"],
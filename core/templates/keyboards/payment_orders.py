@@ -2,10 +2,12 @@ from itertools import zip_longest
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from core.caching.keyboards import cached_keyboard
 from core.db.database_handler import DatabaseHandler
 from core.services.texts import get_texts
 
 
+@cached_keyboard
 async def get_payment_categories_keyboard(db: DatabaseHandler) -> InlineKeyboardMarkup:
     categories = await db.get_payment_categories()
     keyboard_list = []
@@ -26,6 +28,7 @@ async def get_payment_categories_keyboard(db: DatabaseHandler) -> InlineKeyboard
     return InlineKeyboardMarkup(inline_keyboard=keyboard_list)
 
 
+@cached_keyboard
 async def get_payment_order_final_keyboard(language: str, db: DatabaseHandler):
     texts = await get_texts(
         unique_names=["submit_button", "start_over_button"],
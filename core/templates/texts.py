@@ -73,9 +73,29 @@ predefined_texts = {
         "en": "Invalid account number. Please enter a valid phone number or bank card number.",
         "ru": "Неверный номер счета. Пожалуйста, введите корректный номер телефона или банковской карты.",
     },
+    "invalid_text_field": {
+        "en": "The text is empty or too long. Please send a shorter text.",
+        "ru": "Текст пустой или слишком длинный. Пожалуйста, отправьте текст покороче.",
+    },
     "order_application_template": {
-        "en": "Order Application:\n\n- Amount: {amount}\n- Currency from: {currency_from_name}\n- Currency to: {currency_to_name}\n- Account Number: {account_number}\n- Bank: {bank}\n- Receiver: {receiver}\n\nMake sure you have filled correctly all fields before submitting the order.",
-        "ru": "Заявка на обмен:\n\n- Сумма: {amount}\n- Валюта обмена: {currency_from_name}\n- Валюта к получению: {currency_to_name}\n- Номер счета: {account_number}\n- Банк: {bank}\n- Получатель: {receiver}\n\nПожалуйста, убедитесь, что все поля заполнены правильно перед отправкой заявки на обмен.",
+        "en": "Order Application:\n\n- Amount: {amount}\n- Currency from: {currency_from_name}\n- Currency to: {currency_to_name}\n- Rate: {rate}\n- You receive: {converted_amount}\n- Account Number: {account_number}\n- Bank: {bank}\n- Receiver: {receiver}\n\nMake sure you have filled correctly all fields before submitting the order.",
+        "ru": "Заявка на обмен:\n\n- Сумма: {amount}\n- Валюта обмена: {currency_from_name}\n- Валюта к получению: {currency_to_name}\n- Курс: {rate}\n- К получению: {converted_amount}\n- Номер счета: {account_number}\n- Банк: {bank}\n- Получатель: {receiver}\n\nПожалуйста, убедитесь, что все поля заполнены правильно перед отправкой заявки на обмен.",
+    },
+    "rate_to_be_confirmed": {
+        "en": "to be confirmed by the operator",
+        "ru": "уточняется оператором",
+    },
+    "quote_expired": {
+        "en": "The quote has expired, the rate was updated. Please check the order and submit it again.",
+        "ru": "Срок действия курса истек, курс обновлен. Проверьте заявку и отправьте ее еще раз.",
+    },
+    "no_exchange_route": {
+        "en": "This pair can't be exchanged right now. Please choose another currency.",
+        "ru": "Эту пару сейчас нельзя обменять. Пожалуйста, выберите другую валюту.",
+    },
+    "order_command_usage": {
+        "en": "Quick order format:\n/order <amount> <from> <to>; <account number>; <bank>; <receiver>\n\nExample:\n/order 100000 kzt rub; +7 701 123 45 67; Kaspi; Ivan Ivanov",
+        "ru": "Формат быстрой заявки:\n/order <сумма> <из> <в>; <номер счета>; <банк>; <получатель>\n\nПример:\n/order 100000 kzt rub; +7 701 123 45 67; Kaspi; Иван Иванов",
     },
     "submit_button": {
         "en": "Submit",
@@ -1,42 +1,203 @@
 import asyncio
+import signal
+from typing import List
 
 from aiogram import Bot, Dispatcher
 from aiogram.types import BotCommand
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 from loguru import logger
 
-from config import BOT_TOKEN, DB_URL
+from config import (
+    BOT_MODE,
+    BOT_TOKEN,
+    DB_FAST_PATH,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_URL,
+    QUOTE_TTL,
+    RATE_FEED_FILE,
+    RATE_FEED_INTERVAL,
+    RATE_FEED_MAX_STALENESS,
+    RATE_FEED_URL,
+    ROUTE_MAX_HOPS,
+    TEXT_CACHE_TTL,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
+    WEB_SERVER_HOST,
+    WEB_SERVER_PORT,
+)
 from core.db.database_handler import DatabaseHandler
+from core.db.fsm_storage import DatabaseStorage
+from core.middlewares.storage import StorageFlushMiddleware
 from core.middlewares.throttling import ThrottlingMiddleware
-from routers import commands, exchange_orders, menus, payment_orders
+from core.middlewares.user import UserMiddleware
+from core.services.broadcast import Broadcaster
+from core.services.delete import DeletionWorker
+from core.services.journal import OrderJournal
+from core.services.quotes import QuoteService
+from core.services.rate_feed import RateFeed
+from core.services.rate_providers import (
+    HttpRateProvider,
+    JsonFileRateProvider,
+    RateProvider,
+)
+from core.services.sender import SendScheduler
+from routers import commands, exchange_orders, inline, menus, payment_orders
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """
+    Serve updates from an aiohttp server instead of long polling.
+
+    Updates are processed inside the request, so a handler may return a Bot API
+    method (e.g. ``callback_query.answer()``) and it is sent back in the webhook
+    response without a separate request.
+    """
+    app = web.Application()
+    handler = SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=False,
+        secret_token=WEBHOOK_SECRET,
+    )
+    # Not handler.register(): it would close the bot session on shutdown, before
+    # main() has flushed the outbound queues
+    app.router.add_route("POST", WEBHOOK_PATH, handler.handle)
+    setup_application(app, dp, bot=bot)
+
+    await bot.set_webhook(
+        url=f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    logger.info(f"Webhook set, listening on {WEB_SERVER_HOST}:{WEB_SERVER_PORT}")
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=WEB_SERVER_HOST, port=WEB_SERVER_PORT)
+    await site.start()
+
+    # Like start_polling: SIGTERM (docker stop) and SIGINT end the run normally,
+    # so main() flushes the queues and saves the checkpoints
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        await stop_event.wait()
+        logger.info("Stopping webhook server")
+    finally:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+        await runner.cleanup()
+
+
+def build_rate_providers() -> List[RateProvider]:
+    providers: List[RateProvider] = []
+    if RATE_FEED_URL:
+        providers.append(HttpRateProvider(RATE_FEED_URL))
+    if RATE_FEED_FILE:
+        providers.append(JsonFileRateProvider(RATE_FEED_FILE))
+    return providers
 
 
 async def main() -> None:
     logger.info("Starting bot")
 
-    dp = Dispatcher()
     bot = Bot(token=BOT_TOKEN)
 
-    db = DatabaseHandler(DB_URL)
+    db = DatabaseHandler(
+        DB_URL,
+        text_cache_ttl=TEXT_CACHE_TTL,
+        user_cache_size=USER_CACHE_SIZE,
+        user_cache_ttl=USER_CACHE_TTL,
+        route_max_hops=ROUTE_MAX_HOPS,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+        use_fast_path=DB_FAST_PATH,
+    )
 
-    await db.init()
+    bot_commands = [
+        BotCommand(command="/start", description="Запуск / перезапуск бота 🚀"),
+        BotCommand(command="/order", description="Быстрая заявка на обмен ⚡"),
+    ]
+    # Telegram round trip runs while the database is being checked
+    await asyncio.gather(db.init(), bot.set_my_commands(bot_commands))
+    logger.info("Database ready, bot commands set")
+
+    storage = DatabaseStorage(db)
+    dp = Dispatcher(storage=storage)
+
+    order_journal = OrderJournal(db)
+    order_journal.start()
+    send_scheduler = SendScheduler(bot)
+    send_scheduler.start()
+    deletion_worker = DeletionWorker(bot)
+    deletion_worker.start()
+    rate_feed = RateFeed(
+        db,
+        build_rate_providers(),
+        interval=RATE_FEED_INTERVAL,
+        max_staleness=RATE_FEED_MAX_STALENESS,
+    )
+    rate_feed.start()
+    quote_service = QuoteService(db, ttl=QUOTE_TTL)
+    quote_service.start()
+    broadcaster = Broadcaster(db, send_scheduler)
+    await broadcaster.resume()
 
     dp["db"] = db
+    dp["order_journal"] = order_journal
+    dp["send_scheduler"] = send_scheduler
+    dp["deletion_worker"] = deletion_worker
+    dp["rate_feed"] = rate_feed
+    dp["quote_service"] = quote_service
+    dp["broadcaster"] = broadcaster
     dp.include_routers(
         commands.router,
         exchange_orders.router,
+        inline.router,
         menus.router,
         payment_orders.router,
     )
-    dp.message.middleware(ThrottlingMiddleware())
-
-    bot_commands = [
-        BotCommand(command="/start", description="Запуск / перезапуск бота 🚀"),
-    ]
-    await bot.set_my_commands(bot_commands)
+    dp.update.outer_middleware(StorageFlushMiddleware(storage))
+    throttling = ThrottlingMiddleware()
+    dp.message.middleware(throttling)
+    dp.callback_query.middleware(throttling)
+    dp.message.middleware(UserMiddleware())
+    dp.callback_query.middleware(UserMiddleware())
 
-    logger.info("Bot commands set")
     await logger.complete()
-    await dp.start_polling(bot)
+    try:
+        if BOT_MODE == "webhook":
+            await run_webhook(dp, bot)
+        else:
+            await bot.delete_webhook()
+            # The session is closed below, once the outbound queues are flushed
+            await dp.start_polling(bot, close_bot_session=False)
+    finally:
+        await broadcaster.stop()
+        await rate_feed.stop()
+        await quote_service.stop()
+        await deletion_worker.stop()
+        await send_scheduler.stop()
+        await bot.session.close()
+        await order_journal.stop()
+        await db.close()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,26 @@
-from aiogram import Router
-from aiogram.filters import Command
+import html
+import json
+from typing import Optional
+
+from aiogram import Bot, Router
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 
 from core.db.database_handler import DatabaseHandler
+from core.db.views import UserView
+from core.services.broadcast import Broadcaster
+from core.services.order_links import create_order_link, resolve_order_link
+from core.services.quotes import QuoteService
+from core.services.rate_feed import RateFeed
+from core.services.rate_matrix import reprice_currency_pairs
 from core.services.texts import get_texts
 from core.templates.keyboards.admin import get_admin_panel_keyboard
 from core.templates.keyboards.menu import (
     get_main_menu_keyboard,
     get_terms_of_service_keyboard,
 )
+from routers.exchange_orders import place_order_from_text
 
 router = Router()
 
@@ -22,11 +33,20 @@ def strip_bot_suffix(text: str) -> str:
     return text.split("@", 1)[0]
 
 
-@router.message(Command("start"))
+@router.message(Command("start"), flags={"skip_user": True})
 async def start_command_handler(
-    message: Message, db: DatabaseHandler, state: FSMContext
+    message: Message,
+    command: CommandObject,
+    db: DatabaseHandler,
+    state: FSMContext,
+    quote_service: QuoteService,
 ) -> None:
-    """Handle /start command by initializing user and sending greeting with the main menu."""
+    """
+    Handle /start command by initializing user and sending greeting with the main menu.
+
+    A deep link made with ``/order_link`` (``t.me/<bot>?start=<token>``) opens
+    the confirmation of the stored order right away.
+    """
     await state.clear()
 
     user_language = message.from_user.language_code or "en"
@@ -51,6 +71,14 @@ async def start_command_handler(
         )
         return
 
+    if command.args:
+        order_text = await resolve_order_link(db, command.args)
+        if order_text:
+            await place_order_from_text(
+                message, order_text, state, db, user, quote_service
+            )
+            return
+
     await message.answer(
         texts["greetings"],
         reply_markup=await get_main_menu_keyboard(
@@ -61,9 +89,8 @@ async def start_command_handler(
 
 @router.message(Command("admin"))
 async def admin_command_handler(
-    message: Message, db: DatabaseHandler, state: FSMContext
+    message: Message, db: DatabaseHandler, state: FSMContext, user: UserView
 ):
-    user = await db.get_user(message.from_user.id)
     texts = await get_texts(
         unique_names=["admin_panel"],
         language_code=user.language or "en",
@@ -77,3 +104,112 @@ async def admin_command_handler(
         texts["admin_panel"],
         reply_markup=await get_admin_panel_keyboard(user.language or "en", db),
     )
+
+
+@router.message(Command("db_stats"))
+async def db_stats_command_handler(
+    message: Message,
+    db: DatabaseHandler,
+    user: UserView,
+    rate_feed: Optional[RateFeed] = None,
+) -> None:
+    """Show connection pool, cache and rate feed statistics to admins."""
+    if not user.is_admin:
+        return
+
+    stats = {"pool": db.pool_stats(), "caches": db.cache_stats()}
+    if rate_feed is not None:
+        stats["rate_feed"] = rate_feed.stats()
+    await message.answer(
+        f"<pre>{html.escape(json.dumps(stats, indent=2))}</pre>", parse_mode="HTML"
+    )
+
+
+@router.message(Command("order_link"))
+async def order_link_command_handler(
+    message: Message,
+    command: CommandObject,
+    bot: Bot,
+    db: DatabaseHandler,
+    user: UserView,
+) -> None:
+    """``/order_link <order text>`` makes a /start link to the order (admins only)."""
+    if not user.is_admin:
+        return
+
+    try:
+        link = await create_order_link(bot, db, command.args or "")
+    except ValueError as e:
+        await message.answer(f"{e}\nUsage: /order_link <order text>")
+        return
+    await message.answer(link)
+
+
+@router.message(Command("reprice"))
+async def reprice_command_handler(
+    message: Message, db: DatabaseHandler, user: UserView, rate_feed: RateFeed
+) -> None:
+    """
+    Recompute currency pair rates from the base rates (admins only); pairs
+    quoted by the rate feed are left alone.
+    """
+    if not user.is_admin:
+        return
+
+    changed = await reprice_currency_pairs(db, exclude=rate_feed.quoted_pairs)
+    await message.answer(f"Repriced, {len(changed)} pairs changed")
+
+
+@router.message(Command("broadcast"))
+async def broadcast_command_handler(
+    message: Message,
+    command: CommandObject,
+    user: UserView,
+    broadcaster: Broadcaster,
+) -> None:
+    """``/broadcast <text>`` sends the text to all users (admins only)."""
+    if not user.is_admin:
+        return
+
+    if not command.args:
+        await message.answer("Usage: /broadcast <text>")
+        return
+    if not await broadcaster.start(command.args, message.chat.id):
+        state = await broadcaster.status()
+        if state in (None, "finished"):
+            # The lock was only briefly held by another process
+            await message.answer("The broadcast lock is busy, try again")
+            return
+        await message.answer(
+            f"Another broadcast is {state}, {broadcaster.progress.summary()}. "
+            "Cancel it with /broadcast_cancel first"
+        )
+        return
+    await message.answer("Broadcast started")
+
+
+@router.message(Command("broadcast_status"))
+async def broadcast_status_command_handler(
+    message: Message, user: UserView, broadcaster: Broadcaster
+) -> None:
+    if not user.is_admin:
+        return
+
+    state = await broadcaster.status()
+    if state is None:
+        await message.answer("No broadcasts yet")
+        return
+    await message.answer(f"Broadcast {state}, {broadcaster.progress.summary()}")
+
+
+@router.message(Command("broadcast_cancel"))
+async def broadcast_cancel_command_handler(
+    message: Message, user: UserView, broadcaster: Broadcaster
+) -> None:
+    if not user.is_admin:
+        return
+
+    if await broadcaster.cancel():
+        await message.answer(f"Broadcast cancelled, {broadcaster.progress.summary()}")
+    else:
+        await message.answer("No broadcast to cancel")
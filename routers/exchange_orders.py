@@ -1,15 +1,28 @@
-import asyncio
-import re
+from decimal import Decimal
+from typing import Any, Dict, Optional
 
 from aiogram import Router, F
-from aiogram.filters import StateFilter
+from aiogram.filters import Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
+from aiogram.methods import EditMessageText, SendMessage
 from aiogram.types import CallbackQuery, Message
 
 from config import LEAD_CHAT
 from core.db.database_handler import DatabaseHandler
-from core.services.delete import safe_delete_messages
+from core.db.tables import ExchangeOrder
+from core.db.views import UserView
+from core.services.delete import DeletionWorker
+from core.services.journal import OrderJournal
+from core.services.orders import (
+    parse_account_number,
+    parse_amount,
+    parse_order,
+    parse_text_field,
+)
+from core.services.quotes import Quote, QuoteService, format_rate
+from core.services.sender import Priority, SendScheduler
 from core.services.texts import get_texts
+from core.templates.keyboards.menu import get_terms_of_service_keyboard
 from core.templates.keyboards.orders import (
     get_currencies_keyboard,
     get_order_final_keyboard,
@@ -19,13 +32,160 @@ from core.templates.states.orders import CreateOrderState
 router = Router()
 
 
+def render_order_text(
+    template: str,
+    data: Dict[str, Any],
+    quote: Optional[Quote],
+    rate_pending: str,
+    db: DatabaseHandler,
+) -> str:
+    """
+    Fill the order summary template with the FSM data and the locked quote.
+
+    Without a quote (no route between the currencies) the rate and the converted
+    amount are shown as ``rate_pending``; the operator confirms them.
+    """
+    snapshot = db.currency_cache.snapshot
+    currency_from = snapshot.get_currency(data["currency_from_symbol"])
+    currency_to = snapshot.get_currency(data["currency_to_symbol"])
+    if quote is None:
+        rate = converted_amount = rate_pending
+    else:
+        rate = format_rate(quote.rate)
+        converted_amount = f"{quote.converted_amount} {currency_to.name}"
+    return template.format(
+        amount=data["amount"],
+        currency_from_name=currency_from.name,
+        currency_to_name=currency_to.name,
+        rate=rate,
+        converted_amount=converted_amount,
+        account_number=data["account_number"],
+        bank=data["bank"],
+        receiver=data["receiver"],
+    )
+
+
+async def prepare_order_confirmation(
+    state: FSMContext,
+    data: Dict[str, Any],
+    quote: Optional[Quote],
+    db: DatabaseHandler,
+    language: str,
+) -> str:
+    """
+    Store a complete order in FSM data and return the confirmation text.
+
+    Shared by the step-by-step dialog and the one-shot ``/order`` command; the
+    caller shows the text with ``get_order_final_keyboard``.
+    """
+    texts = await get_texts(
+        ["order_application_template", "rate_to_be_confirmed"], language, db=db
+    )
+    text = render_order_text(
+        texts["order_application_template"],
+        data,
+        quote,
+        texts["rate_to_be_confirmed"],
+        db,
+    )
+    await state.update_data(
+        amount=data["amount"],
+        currency_from_symbol=data["currency_from_symbol"],
+        currency_to_symbol=data["currency_to_symbol"],
+        account_number=data["account_number"],
+        bank=data["bank"],
+        receiver=data["receiver"],
+        quote_id=quote.id if quote is not None else None,
+        order_text=text,
+    )
+    await state.set_state(None)
+    return text
+
+
+def is_exchangeable(db: DatabaseHandler, from_symbol: str, to_symbol: str) -> bool:
+    """Both currencies exist and are active; a route is not required."""
+    snapshot = db.currency_cache.snapshot
+    currencies = (snapshot.get_currency(from_symbol), snapshot.get_currency(to_symbol))
+    return from_symbol != to_symbol and all(
+        currency is not None and currency.is_active for currency in currencies
+    )
+
+
+async def place_order_from_text(
+    message: Message,
+    text: str,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    quote_service: QuoteService,
+) -> None:
+    """Parse a whole order from one message and go straight to the confirmation."""
+    language = user.language or "ru"
+    draft, errors = parse_order(text)
+    if draft is not None and not is_exchangeable(
+        db, draft.currency_from, draft.currency_to
+    ):
+        draft, errors = None, ["no_exchange_route"]
+    if draft is None:
+        names = list(dict.fromkeys(errors + ["order_command_usage"]))
+        texts = await get_texts(names, language, db=db)
+        await message.answer("\n\n".join(texts[name] for name in names))
+        return
+
+    await state.clear()
+    quote = quote_service.quote(draft.currency_from, draft.currency_to, draft.amount)
+    text = await prepare_order_confirmation(
+        state,
+        {
+            "amount": str(draft.amount),
+            "currency_from_symbol": draft.currency_from,
+            "currency_to_symbol": draft.currency_to,
+            "account_number": draft.account_number,
+            "bank": draft.bank,
+            "receiver": draft.receiver,
+        },
+        quote,
+        db,
+        language,
+    )
+    await message.answer(
+        text, reply_markup=await get_order_final_keyboard(language, db=db)
+    )
+
+
+@router.message(Command("order"))
+async def order_command_handler(
+    message: Message,
+    command: CommandObject,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    quote_service: QuoteService,
+) -> None:
+    """``/order 1000 kzt rub; <account number>; <bank>; <receiver>``"""
+    if user is None or not user.is_agreed_with_terms:
+        language = user.language if user else "ru"
+        texts = await get_texts(["must_agree_with_terms"], language, db=db)
+        await message.answer(
+            texts["must_agree_with_terms"],
+            reply_markup=await get_terms_of_service_keyboard(language, db),
+        )
+        return
+
+    await place_order_from_text(
+        message, command.args or "", state, db, user, quote_service
+    )
+
+
 @router.callback_query(F.data == "exchange_button")
 async def exchange_button_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
 
     await state.set_state(CreateOrderState.waiting_for_amount)
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["enter_amount_text"],
         language_code=user.language or "ru",
@@ -37,45 +197,52 @@ async def exchange_button_handler(
 
 @router.message(StateFilter(CreateOrderState.waiting_for_amount))
 async def exchange_order_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
 ) -> None:
     data = await state.get_data()
-    amount = message.text.replace(",", ".")
-    user, keyboard = await asyncio.gather(
-        db.get_user(message.from_user.id), get_currencies_keyboard(db)
-    )
     texts = await get_texts(
         unique_names=["incorrect_amount", "choose_currency_from_exchange"],
         language_code=user.language or "ru",
         db=db,
     )
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
-    try:
-        amount = float(amount)
-        await state.update_data(amount=amount)
-    except ValueError:
-        await message.bot.edit_message_text(
-            texts["incorrect_amount"],
-            chat_id=message.chat.id,
-            message_id=data["order_message"],
+    deletion_worker.delete(message.chat.id, [message.message_id])
+    amount = parse_amount(message.text or "")
+    if amount is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts["incorrect_amount"],
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
         )
         return
+    # FSM data is stored as JSON, keep the exact amount as a string
+    await state.update_data(amount=str(amount))
     await state.set_state(CreateOrderState.waiting_for_currency_from)
-    await message.bot.edit_message_text(
-        texts["choose_currency_from_exchange"],
-        chat_id=message.chat.id,
-        message_id=data["order_message"],
-        reply_markup=await get_currencies_keyboard(db),
+    send_scheduler.submit(
+        EditMessageText(
+            text=texts["choose_currency_from_exchange"],
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+            reply_markup=await get_currencies_keyboard(db),
+        )
     )
 
 
 @router.callback_query(StateFilter(CreateOrderState.waiting_for_currency_from))
 async def exchange_currency_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     currency_symbol = callback_query.data.split("_")[1]
     await state.set_state(CreateOrderState.waiting_for_currency_to)
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["choose_currency_to_exchange"],
         language_code=user.language or "ru",
@@ -92,11 +259,13 @@ async def exchange_currency_handler(
 
 @router.callback_query(StateFilter(CreateOrderState.waiting_for_currency_to))
 async def exchange_currency_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     currency_symbol = callback_query.data.split("_")[1]
     await state.set_state(CreateOrderState.waiting_for_account_number)
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["enter_account_number"],
         language_code=user.language or "ru",
@@ -108,39 +277,31 @@ async def exchange_currency_handler(
 
 @router.message(StateFilter(CreateOrderState.waiting_for_account_number))
 async def exchange_account_number_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
 ) -> None:
     """Обработчик ввода номера счета (телефон или карта)"""
 
-    ACCOUNT_NUMBER_PATTERN = re.compile(
-        r"^(?:" r"(?:\+?[\d\s\-()]{10,})|" r"(?:\d[\d\s\-]{13,})" r")$"
-    )
-
-    account_number = message.text.strip()
-    user = await db.get_user(message.from_user.id)
     data = await state.get_data()
 
     texts = await get_texts(
         ["invalid_account_number", "enter_bank"], user.language or "ru", db=db
     )
 
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
+    deletion_worker.delete(message.chat.id, [message.message_id])
 
-    if not ACCOUNT_NUMBER_PATTERN.match(account_number):
-        await message.bot.edit_message_text(
-            texts.get("invalid_account_number"),
-            chat_id=message.chat.id,
-            message_id=data["order_message"],
-        )
-        return
-
-    cleaned_account = re.sub(r"[\s\-()]+", "", account_number)
-
-    if len(cleaned_account) < 10:
-        await message.bot.edit_message_text(
-            texts.get("invalid_account_number"),
-            chat_id=message.chat.id,
-            message_id=data["order_message"],
+    cleaned_account = parse_account_number(message.text or "")
+    if cleaned_account is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts.get("invalid_account_number"),
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
         )
         return
 
@@ -148,70 +309,145 @@ async def exchange_account_number_handler(
 
     await state.set_state(CreateOrderState.waiting_for_bank)
 
-    await message.bot.edit_message_text(
-        texts.get("enter_bank"),
-        chat_id=message.chat.id,
-        message_id=data["order_message"],
+    send_scheduler.submit(
+        EditMessageText(
+            text=texts.get("enter_bank"),
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+        )
     )
 
 
 @router.message(StateFilter(CreateOrderState.waiting_for_bank))
 async def exchange_bank_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
 ) -> None:
-    await state.set_state(CreateOrderState.waiting_for_receiver)
-    user = await db.get_user(message.from_user.id)
-    texts = await get_texts(["enter_receiver"], user.language or "ru", db=db)
-    data = await state.get_data()
-    await state.update_data(bank=message.text)
-    await message.bot.edit_message_text(
-        texts.get("enter_receiver"),
-        chat_id=message.chat.id,
-        message_id=data["order_message"],
+    texts = await get_texts(
+        ["enter_receiver", "invalid_text_field"], user.language or "ru", db=db
     )
+    data = await state.get_data()
+    deletion_worker.delete(message.chat.id, [message.message_id])
+
+    bank = parse_text_field(message.text or "")
+    if bank is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts["invalid_text_field"],
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
+        )
+        return
 
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
+    await state.set_state(CreateOrderState.waiting_for_receiver)
+    await state.update_data(bank=bank)
+    send_scheduler.submit(
+        EditMessageText(
+            text=texts.get("enter_receiver"),
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+        )
+    )
 
 
 @router.message(StateFilter(CreateOrderState.waiting_for_receiver))
 async def exchange_receiver_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
+    quote_service: QuoteService,
 ) -> None:
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
+    deletion_worker.delete(message.chat.id, [message.message_id])
     data = await state.get_data()
-    user, currency_from, currency_to = await asyncio.gather(
-        db.get_user(message.from_user.id),
-        db.get_currency_by_symbol(data["currency_from_symbol"]),
-        db.get_currency_by_symbol(data["currency_to_symbol"]),
-    )
-    texts = await get_texts(
-        ["order_application_template"], user.language or "ru", db=db
+    texts = await get_texts(["invalid_text_field"], user.language or "ru", db=db)
+    receiver = parse_text_field(message.text or "")
+    if receiver is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts["invalid_text_field"],
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
+        )
+        return
+    data["receiver"] = receiver
+    # The rate is locked when the user first sees it; no route -> no quote
+    quote = quote_service.quote(
+        data["currency_from_symbol"],
+        data["currency_to_symbol"],
+        Decimal(data["amount"]),
     )
-    await state.update_data(receiver=message.text)
-    text = texts["order_application_template"].format(
-        amount=data["amount"],
-        currency_from_name=currency_from.name,
-        currency_to_name=currency_to.name,
-        account_number=data["account_number"],
-        bank=data["bank"],
-        receiver=message.text,
+    text = await prepare_order_confirmation(
+        state, data, quote, db, user.language or "ru"
     )
-    await state.update_data(order_text=text)
-    await state.set_state(None)
-    await message.bot.edit_message_text(
-        text,
-        chat_id=message.chat.id,
-        message_id=data["order_message"],
-        reply_markup=await get_order_final_keyboard(user.language or "ru", db=db),
+    send_scheduler.submit(
+        EditMessageText(
+            text=text,
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+            reply_markup=await get_order_final_keyboard(user.language or "ru", db=db),
+        )
     )
 
 
 @router.callback_query(F.data == "submit_order")
 async def submit_order_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    order_journal: OrderJournal,
+    send_scheduler: SendScheduler,
+    quote_service: QuoteService,
 ) -> None:
     data = await state.get_data()
-    user = await db.get_user(callback_query.from_user.id)
+    if "order_text" not in data:
+        # Already submitted (double tap) or an outdated confirmation message
+        await callback_query.message.edit_reply_markup(reply_markup=None)
+        await callback_query.answer()
+        return
+
+    quote = None
+    if data.get("quote_id") is not None:
+        quote = quote_service.consume(data["quote_id"])
+        if quote is None:
+            # Show the current rate (or none) and let the user confirm it
+            language = user.language or "ru"
+            texts = await get_texts(["quote_expired"], language, db=db)
+            quote = quote_service.quote(
+                data["currency_from_symbol"],
+                data["currency_to_symbol"],
+                Decimal(data["amount"]),
+            )
+            text = await prepare_order_confirmation(state, data, quote, db, language)
+            await callback_query.message.edit_text(
+                text, reply_markup=await get_order_final_keyboard(language, db=db)
+            )
+            await callback_query.answer(texts["quote_expired"], show_alert=True)
+            return
+
+    # The draft is consumed before the order is recorded
+    await state.clear()
+    order_journal.record(
+        ExchangeOrder,
+        user_tg_id=callback_query.from_user.id,
+        amount=Decimal(data["amount"]),
+        currency_from=data["currency_from_symbol"],
+        currency_to=data["currency_to_symbol"],
+        account_number=data["account_number"],
+        bank=data["bank"],
+        receiver=data["receiver"],
+        rate=quote.rate if quote is not None else None,
+        converted_amount=quote.converted_amount if quote is not None else None,
+    )
     texts = await get_texts(["order_sent"], user.language or "ru", db=db)
 
     text = (
@@ -221,16 +457,18 @@ async def submit_order_handler(
 
     await callback_query.message.edit_reply_markup(reply_markup=None)
     await callback_query.message.answer(texts["order_sent"])
-    await callback_query.bot.send_message(
-        LEAD_CHAT,
-        text=text,
-        parse_mode="HTML",
+    send_scheduler.submit(
+        SendMessage(chat_id=LEAD_CHAT, text=text, parse_mode="HTML"),
+        Priority.LEAD,
     )
 
 
 @router.callback_query(F.data == "start_over")
 async def start_over_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     await state.clear()
-    await exchange_button_handler(callback_query, state, db)
+    await exchange_button_handler(callback_query, state, db, user)
@@ -0,0 +1,73 @@
+import re
+
+from aiogram import Router
+from aiogram.methods import AnswerInlineQuery
+from aiogram.types import (
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+)
+
+from config import INLINE_CACHE_TIME
+from core.db.database_handler import DatabaseHandler
+from core.services.orders import parse_amount
+from core.services.quotes import format_rate, price
+
+router = Router()
+
+# "<amount> <from> <to>", e.g. "1000 kzt rub" or "1 000,50 KZT RUB"
+INLINE_QUERY_PATTERN = re.compile(
+    r"^\s*(?P<amount>\d[\d\s]*(?:[.,]\d{1,6})?)"
+    r"\s+(?P<from>[a-zA-Z]{2,10})"
+    r"\s+(?P<to>[a-zA-Z]{2,10})\s*$"
+)
+
+
+@router.inline_query()
+async def inline_quote_handler(
+    inline_query: InlineQuery, db: DatabaseHandler
+) -> AnswerInlineQuery:
+    """
+    Answer ``@bot <amount> <from> <to>`` with the converted amount.
+
+    Only in-memory data is used (currency snapshot and route table). The answer
+    does not depend on the user, so Telegram may serve it to everyone who sends
+    the same query during ``cache_time``.
+    """
+    results = []
+    match = INLINE_QUERY_PATTERN.match(inline_query.query)
+    if match:
+        from_symbol = match["from"].lower()
+        to_symbol = match["to"].lower()
+        snapshot = db.currency_cache.snapshot
+        currency_from = snapshot.get_currency(from_symbol)
+        currency_to = snapshot.get_currency(to_symbol)
+        route = db.route_table.get(from_symbol, to_symbol)
+        amount = parse_amount(re.sub(r"\s+", "", match["amount"]))
+
+        if (
+            amount is not None
+            and currency_from is not None
+            and currency_to is not None
+            and route is not None
+        ):
+            rate, converted_amount = price(route.rate, amount)
+            rate = format_rate(rate)
+            title = (
+                f"{amount} {currency_from.name} → {converted_amount} {currency_to.name}"
+            )
+            description = f"1 {currency_from.symbol.upper()} = {rate} {currency_to.symbol.upper()}"
+            if route.hops > 1:
+                description += " (" + " → ".join(s.upper() for s in route.path) + ")"
+            results.append(
+                InlineQueryResultArticle(
+                    id=f"{from_symbol}_{to_symbol}_{amount}",
+                    title=title,
+                    description=description,
+                    input_message_content=InputTextMessageContent(
+                        message_text=f"{title}\n{description}"
+                    ),
+                )
+            )
+
+    return inline_query.answer(results, cache_time=INLINE_CACHE_TIME, is_personal=False)
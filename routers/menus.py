@@ -6,6 +6,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
 
 from core.db.database_handler import DatabaseHandler
+from core.db.views import UserView
 from core.services.texts import get_texts
 from core.templates.keyboards.menu import (
     get_main_menu_keyboard,
@@ -18,14 +19,13 @@ router = Router()
 
 @router.callback_query(F.data == "main_menu")
 async def main_menu_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     await state.clear()
 
-    user = await db.get_user(
-        callback_query.from_user.id,
-    )
-
     texts = await get_texts(
         unique_names=["greetings"],
         language_code=user.language or "ru",
@@ -42,16 +42,18 @@ async def main_menu_handler(
 
 @router.callback_query(F.data == "rate_button")
 async def exchange_button_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["rate_template", "no_currency_pairs"],
         language_code=user.language or "ru",
         db=db,
     )
 
-    currency_pairs = await db.get_currency_pairs()
+    currency_pairs = db.currency_cache.snapshot.active_pairs
 
     if not currency_pairs:
         text = texts["no_currency_pairs"]
@@ -71,9 +73,11 @@ async def exchange_button_handler(
 
 @router.callback_query(F.data == "about_button")
 async def about_button_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
-    user = await db.get_user(callback_query.from_user.id)
     texts, keyboard = await asyncio.gather(
         get_texts(
             unique_names=["about_us_text"], language_code=user.language or "ru", db=db
@@ -87,9 +91,11 @@ async def about_button_handler(
 
 @router.callback_query(F.data == "settings_button")
 async def settings_button_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["settings_text"], language_code=user.language or "ru", db=db
     )
@@ -101,7 +107,10 @@ async def settings_button_handler(
 
 @router.callback_query(F.data.startswith("lang_"))
 async def change_language_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     language_code = callback_query.data.split("_")[1]
     user = await db.update_user(callback_query.from_user.id, language=language_code)
@@ -116,7 +125,10 @@ async def change_language_handler(
 
 @router.callback_query(F.data == "agree_button")
 async def agree_terms_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
-    await db.update_user(callback_query.from_user.id, is_agreed_with_terms=True)
-    await main_menu_handler(callback_query, state, db)
+    user = await db.update_user(callback_query.from_user.id, is_agreed_with_terms=True)
+    await main_menu_handler(callback_query, state, db, user)
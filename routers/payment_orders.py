@@ -3,11 +3,17 @@ import asyncio
 from aiogram import Router, F
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
+from aiogram.methods import EditMessageText, SendMessage
 from aiogram.types import CallbackQuery, Message
 
 from config import LEAD_CHAT
 from core.db.database_handler import DatabaseHandler
-from core.services.delete import safe_delete_messages
+from core.db.tables import PaymentOrder
+from core.db.views import UserView
+from core.services.delete import DeletionWorker
+from core.services.journal import OrderJournal
+from core.services.orders import MAX_LINK_LENGTH, parse_text_field
+from core.services.sender import Priority, SendScheduler
 from core.services.texts import get_texts
 from core.templates.keyboards.payment_orders import (
     get_payment_categories_keyboard,
@@ -20,10 +26,12 @@ router = Router()
 
 @router.callback_query(F.data == "payment_order_button")
 async def payment_order_button_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     await state.set_state(CreatePaymentOrderState.waiting_for_category)
-    user = await db.get_user(callback_query.from_user.id)
     texts = await get_texts(
         unique_names=["choose_payment_category"],
         language_code=user.language or "ru",
@@ -37,9 +45,11 @@ async def payment_order_button_handler(
 
 @router.callback_query(StateFilter(CreatePaymentOrderState.waiting_for_category))
 async def payment_order_category_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
-    user = await db.get_user(callback_query.from_user.id)
     texts, category = await asyncio.gather(
         get_texts(
             unique_names=["choose_payment_amount"],
@@ -59,74 +69,129 @@ async def payment_order_category_handler(
 
 @router.message(StateFilter(CreatePaymentOrderState.waiting_for_amount_with_currency))
 async def payment_order_amount_with_currency_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
 ) -> None:
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
+    deletion_worker.delete(message.chat.id, [message.message_id])
     data = await state.get_data()
-    user = await db.get_user(message.from_user.id)
     texts = await get_texts(
-        unique_names=["send_link"],
+        unique_names=["send_link", "invalid_text_field"],
         language_code=user.language or "ru",
         db=db,
     )
-    await state.update_data(amount_with_currency=message.text)
+    amount_with_currency = parse_text_field(message.text or "")
+    if amount_with_currency is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts["invalid_text_field"],
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
+        )
+        return
+    await state.update_data(amount_with_currency=amount_with_currency)
     await state.set_state(CreatePaymentOrderState.waiting_for_link)
-    await message.bot.edit_message_text(
-        texts["send_link"], chat_id=message.chat.id, message_id=data["order_message"]
+    send_scheduler.submit(
+        EditMessageText(
+            text=texts["send_link"],
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+        )
     )
 
 
 @router.message(StateFilter(CreatePaymentOrderState.waiting_for_link))
 async def payment_order_link_handler(
-    message: Message, state: FSMContext, db: DatabaseHandler
+    message: Message,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    send_scheduler: SendScheduler,
+    deletion_worker: DeletionWorker,
 ) -> None:
-    await safe_delete_messages(message.bot, message.chat.id, [message.message_id])
+    deletion_worker.delete(message.chat.id, [message.message_id])
     data = await state.get_data()
-    user = await db.get_user(message.from_user.id)
     texts = await get_texts(
-        unique_names=["payment_order_template"],
+        unique_names=["payment_order_template", "invalid_text_field"],
         language_code=user.language or "ru",
         db=db,
     )
+    link = parse_text_field(message.text or "", max_length=MAX_LINK_LENGTH)
+    if link is None:
+        send_scheduler.submit(
+            EditMessageText(
+                text=texts["invalid_text_field"],
+                chat_id=message.chat.id,
+                message_id=data["order_message"],
+            )
+        )
+        return
     text = texts["payment_order_template"].format(
         amount_with_currency=data["amount_with_currency"],
         category=data["category"],
-        link=message.text,
+        link=link,
     )
-    await state.update_data(order_text=text)
+    await state.update_data(order_text=text, link=link)
     await state.set_state(None)
-    await message.bot.edit_message_text(
-        text,
-        chat_id=message.chat.id,
-        message_id=data["order_message"],
-        reply_markup=await get_payment_order_final_keyboard(
-            user.language or "ru", db=db
-        ),
+    send_scheduler.submit(
+        EditMessageText(
+            text=text,
+            chat_id=message.chat.id,
+            message_id=data["order_message"],
+            reply_markup=await get_payment_order_final_keyboard(
+                user.language or "ru", db=db
+            ),
+        )
     )
 
 
 @router.callback_query(F.data == "submit_payment_order")
 async def submit_payment_order_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
+    order_journal: OrderJournal,
+    send_scheduler: SendScheduler,
 ) -> None:
     data = await state.get_data()
-    user = await db.get_user(callback_query.from_user.id)
+    if "order_text" not in data:
+        # Already submitted (double tap) or an outdated confirmation message
+        await callback_query.message.edit_reply_markup(reply_markup=None)
+        await callback_query.answer()
+        return
+
+    # The draft is consumed before the order is recorded
+    await state.clear()
+    order_journal.record(
+        PaymentOrder,
+        user_tg_id=callback_query.from_user.id,
+        category=data["category"],
+        amount_with_currency=data["amount_with_currency"],
+        link=data["link"],
+    )
     texts = await get_texts(["payment_order_sent"], user.language or "ru", db=db)
     text = (
         f"НОВАЯ ЗАЯВКА от <a href='tg://user?id={callback_query.from_user.id}'>{callback_query.from_user.first_name or 'Клиент'}</a>\n\n"
         + data["order_text"].split("\n\n")[1]
     )
     await callback_query.message.edit_text(texts["payment_order_sent"])
-    await callback_query.bot.send_message(
-        LEAD_CHAT,
-        text=text,
-        parse_mode="HTML",
+    send_scheduler.submit(
+        SendMessage(chat_id=LEAD_CHAT, text=text, parse_mode="HTML"),
+        Priority.LEAD,
     )
 
 
 @router.callback_query(F.data == "start_over_payment_order")
 async def start_over_payment_order_handler(
-    callback_query: CallbackQuery, state: FSMContext, db: DatabaseHandler
+    callback_query: CallbackQuery,
+    state: FSMContext,
+    db: DatabaseHandler,
+    user: UserView,
 ) -> None:
     await state.clear()
-    await payment_order_button_handler(callback_query, state, db)
+    await payment_order_button_handler(callback_query, state, db, user)
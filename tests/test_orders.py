@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pytest
+
+from core.services.orders import (
+    OrderDraft,
+    parse_account_number,
+    parse_amount,
+    parse_order,
+)
+
+USAGE_EXAMPLE = "100000 kzt rub; +7 701 123 45 67; Kaspi; Ivan Ivanov"
+
+
+def test_parse_order_usage_example():
+    draft, errors = parse_order(USAGE_EXAMPLE)
+    assert errors == []
+    assert draft == OrderDraft(
+        Decimal("100000"), "kzt", "rub", "+77011234567", "Kaspi", "Ivan Ivanov"
+    )
+
+
+def test_parse_order_normalizes_fields():
+    draft, _ = parse_order(" 1,5 KZT Rub ;4400-4301-2345-6789 ;  Halyk ; Ivan ")
+    assert draft.amount == Decimal("1.5")
+    assert (draft.currency_from, draft.currency_to) == ("kzt", "rub")
+    assert draft.account_number == "4400430123456789"
+    assert (draft.bank, draft.receiver) == ("Halyk", "Ivan")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "100000 kzt rub",
+        "100000 kzt; +77011234567; Kaspi; Ivan",
+        "100000 kzt rub; +77011234567; Kaspi",
+        "100000 kzt rub; +77011234567; Kaspi; Ivan; extra",
+    ],
+)
+def test_parse_order_malformed(text):
+    assert parse_order(text) == (None, ["order_command_usage"])
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("0 kzt rub; +77011234567; Kaspi; Ivan", "incorrect_amount"),
+        ("1e3 kzt rub; +77011234567; Kaspi; Ivan", "incorrect_amount"),
+        ("1000000000000 kzt rub; +77011234567; Kaspi; Ivan", "incorrect_amount"),
+        ("100 kzt kzt; +77011234567; Kaspi; Ivan", "no_exchange_route"),
+        ("100 k1 rub; +77011234567; Kaspi; Ivan", "no_exchange_route"),
+        ("100 kzt rub; 12345; Kaspi; Ivan", "invalid_account_number"),
+        ("100 kzt rub; +77011234567; ; Ivan", "order_command_usage"),
+        ("100 kzt rub; +77011234567; Kaspi; " + "x" * 256, "order_command_usage"),
+    ],
+)
+def test_parse_order_invalid_field(text, error):
+    assert parse_order(text) == (None, [error])
+
+
+def test_parse_order_reports_every_invalid_field():
+    draft, errors = parse_order("abc kzt kzt; 123; Kaspi; ")
+    assert draft is None
+    assert errors == [
+        "incorrect_amount",
+        "no_exchange_route",
+        "invalid_account_number",
+        "order_command_usage",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("100", Decimal("100")),
+        ("0,000001", Decimal("0.000001")),
+        ("0.0000001", None),
+        ("-5", None),
+        ("NaN", None),
+    ],
+)
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+def test_parse_account_number_length_bounds():
+    assert parse_account_number("1" * 64) == "1" * 64
+    assert parse_account_number("1" * 65) is None
+    assert parse_account_number("+7 (701) 123") is None